@@ -6,13 +6,18 @@ Extends hybrid_entity_resolution.py to create EntityLineage objects
 for full auditability of entity ID changes.
 """
 
-import json
 import logging
+import re
+import shutil
 import sys
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+import orjson
+
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -23,25 +28,215 @@ from hybrid_entity_resolution import (
     BatchEntityClusterer,
     HybridEntityResolver,
     EntityMergeJob,
-    MerchantNormalizer,
-    SequenceMatcher
+    MerchantNormalizer
 )
 
+try:
+    import numpy as np
+    from rapidfuzz import distance, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+try:
+    from _simscore_numba import NUMBA_AVAILABLE, indel_pairs
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import jellyfish
+    JELLYFISH_AVAILABLE = True
+except ImportError:
+    JELLYFISH_AVAILABLE = False
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Minimum name similarity (Indel ratio, 0-1) for two entities to be merged
+MERGE_SIMILARITY_THRESHOLD = 0.90
+
+# Blocks at least this large get TF-IDF candidate pairs first instead of
+# scoring every pair; candidates are then rescored with the Indel ratio
+TFIDF_MIN_BLOCK = 2048
+
+# Loose recall cutoff for TF-IDF candidates: well below the lowest cosine
+# (~0.28) seen for name pairs at Indel ratio >= 0.90
+TFIDF_CANDIDATE_COSINE = 0.2
+
+# Rows per similarity tile (bounds the sparse product held in memory)
+SIMILARITY_TILE_ROWS = 4096
+
+# Matrix cells per rapidfuzz distance tile (rows = cells // names), which
+# bounds the dense int32/float64 arrays held at once to a few tens of MB
+SIMILARITY_TILE_CELLS = 1 << 22
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+_merchant_normalizer = None  # Created on first use, not at import
+
+
+@lru_cache(maxsize=100_000)
+def normalize_merchant(name: str) -> str:
+    """Memoized MerchantNormalizer.normalize (raw merchant strings repeat heavily)"""
+    global _merchant_normalizer
+    if _merchant_normalizer is None:
+        _merchant_normalizer = MerchantNormalizer()
+    return _merchant_normalizer.normalize(name)
+
+
+def _blocking_keys(name: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Blocking keys for candidate generation
+
+    Only names sharing at least one key are scored against each other:
+    the first 3 normalized chars, plus the metaphone code of the first
+    token (catches spelling variants like "Katherine"/"Catherine").
+    """
+    normalized = _NON_WORD.sub(' ', normalize_merchant(name).lower()).strip()
+    if not normalized:
+        return ()
+
+    keys = [('prefix', normalized[:3])]
+    if JELLYFISH_AVAILABLE:
+        phonetic = jellyfish.metaphone(normalized.split()[0])
+        if phonetic:
+            keys.append(('phonetic', phonetic))
+    return tuple(keys)
+
+
+def _rapidfuzz_pairs(names: List[str], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Score all name pairs with multithreaded rapidfuzz cdist calls
+
+    Similarity is the Indel ratio 2*LCS/total on lowercased names, computed
+    from the integer distance, so it matches _lcs_pairs bit for bit. Rows
+    are scored in tiles against only the names at or after the tile
+    (j >= i), so no full N x N matrix is ever held.
+    """
+    lowered = [name.lower() for name in names]
+    lengths = np.array([len(name) for name in lowered], dtype=np.int64)
+    tile_rows = max(1, SIMILARITY_TILE_CELLS // max(len(lowered), 1))
+    pairs = []
+
+    for start in range(0, len(lowered), tile_rows):
+        stop = start + tile_rows
+        distances = process.cdist(
+            lowered[start:stop], lowered[start:],
+            scorer=distance.Indel.distance,
+            workers=-1,
+            dtype=np.int32
+        )
+        totals = lengths[start:stop, None] + lengths[None, start:]
+        similarities = (totals - distances) / totals
+        # Column c of the tile is name start + c; keep j > i only
+        rows, columns = np.nonzero(np.triu(similarities >= threshold, k=1))
+        pairs.extend(
+            (start + int(row), start + int(column), float(similarities[row, column]))
+            for row, column in zip(rows, columns)
+        )
+    return pairs
+
+
+def _lcs_length(a: str, b: str) -> int:
+    """Longest common subsequence length (bit-parallel, one big-int step per char of b)"""
+    if len(a) < len(b):
+        a, b = b, a
+    masks = {}
+    for position, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << position)
+
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - row.bit_count()
+
+
+if RAPIDFUZZ_AVAILABLE:
+    _indel_distance = distance.Indel.distance
+else:
+    def _indel_distance(a: str, b: str) -> int:
+        """Indel (insert/delete) distance: total length minus twice the LCS"""
+        return len(a) + len(b) - 2 * _lcs_length(a, b)
+
+
+def _lcs_pairs(names: List[str], threshold: float) -> List[Tuple[int, int, float]]:
+    """Score all name pairs by Indel ratio 2*LCS/total (pure Python fallback)"""
+    lowered = [name.lower() for name in names]
+    pairs = []
+
+    for i in range(len(lowered)):
+        for j in range(i + 1, len(lowered)):
+            total = len(lowered[i]) + len(lowered[j])
+            similarity = 2 * _lcs_length(lowered[i], lowered[j]) / total
+            if similarity >= threshold:
+                pairs.append((i, j, similarity))
+
+    return pairs
+
+
+def _embed_names(names: List[str]):
+    """Encode names as L2-normalized char n-gram TF-IDF vectors (sparse CSR)"""
+    vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4))
+    return vectorizer.fit_transform(names)
+
+
+def _tfidf_candidates(names: List[str]) -> List[Tuple[int, int]]:
+    """Pairs (i < j) whose TF-IDF cosine reaches TFIDF_CANDIDATE_COSINE, via tiled sparse matmul"""
+    embeddings = _embed_names(names)
+    transposed = embeddings.T.tocsr()
+    candidates = []
+
+    for start in range(0, len(names), SIMILARITY_TILE_ROWS):
+        tile = (embeddings[start:start + SIMILARITY_TILE_ROWS] @ transposed).tocoo()
+        rows = tile.row + start
+        # Keep only j > i (upper triangle in global coordinates)
+        keep = (tile.col > rows) & (tile.data >= TFIDF_CANDIDATE_COSINE)
+        candidates.extend(zip(rows[keep].tolist(), tile.col[keep].tolist()))
+
+    return candidates
+
+
+def _tfidf_pairs(names: List[str], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Score TF-IDF candidate pairs by Indel ratio
+
+    Cosine only prunes the pair space; every surviving pair is rescored
+    with the same 2*LCS/total ratio as the exact scorers, so the merge
+    threshold keeps its meaning.
+    """
+    lowered = [name.lower() for name in names]
+    pairs = []
+
+    for i, j in sorted(_tfidf_candidates(lowered)):
+        total = len(lowered[i]) + len(lowered[j])
+        similarity = (total - _indel_distance(lowered[i], lowered[j])) / total
+        if similarity >= threshold:
+            pairs.append((i, j, similarity))
+
+    return pairs
+
 
 class EntityMergeJobWithLineage(EntityMergeJob):
     """
     Extended EntityMergeJob that tracks lineage with EntityLineage objects
     """
 
-    def __init__(self, entities_file: Path):
+    def __init__(self, entities_file: Path, similarity_threshold: float = MERGE_SIMILARITY_THRESHOLD):
         super().__init__(entities_file)
         self.entity_lineages = []
         self.lineage_counter = 0
+        self.similarity_threshold = similarity_threshold
+        self.merge_timestamp = None  # Shared ISO timestamp for one merge run
 
     def run_merge_with_lineage(self) -> Dict:
         """
@@ -54,10 +249,13 @@ class EntityMergeJobWithLineage(EntityMergeJob):
         logging.info("PHASE 3: PERIODIC ENTITY MERGE (WITH LINEAGE)")
         logging.info("="*80)
 
+        # One timestamp for every record written by this merge run
+        self.merge_timestamp = datetime.now().isoformat()
+
         # Load entities
         logging.info(f"Loading entities from {self.entities_file}")
-        with open(self.entities_file) as f:
-            data = json.load(f)
+        with open(self.entities_file, 'rb') as f:
+            data = orjson.loads(f.read())
 
         entities = data.get('entities', {})
         logging.info(f"Loaded {len(entities)} entities")
@@ -78,43 +276,46 @@ class EntityMergeJobWithLineage(EntityMergeJob):
         merged_entities, merge_log = self._merge_duplicates_with_lineage(entities, duplicates)
 
         # Save merged entities
+        # The file on disk is still the pre-merge state, so copy it rather
+        # than re-serializing. (Not a hardlink: the rewrite below truncates
+        # the original inode in place.)
         backup_file = self.entities_file.with_suffix('.json.backup')
         logging.info(f"Creating backup: {backup_file}")
-        with open(backup_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        shutil.copyfile(self.entities_file, backup_file)
 
         data['entities'] = merged_entities
-        data['last_merge'] = datetime.now().isoformat()
+        data['last_merge'] = self.merge_timestamp
 
-        with open(self.entities_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(self.entities_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         # Save entity lineage
         lineage_file = self.entities_file.parent / 'entity_lineage.json'
         lineage_output = {
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': self.merge_timestamp,
             'version': '1.0',
             'lineage_count': len(self.entity_lineages),
-            'lineage': [l.to_dict() for l in self.entity_lineages]
+            # orjson serializes the EntityLineage dataclasses natively
+            'lineage': self.entity_lineages
         }
 
-        with open(lineage_file, 'w') as f:
-            json.dump(lineage_output, f, indent=2)
+        with open(lineage_file, 'wb') as f:
+            f.write(orjson.dumps(lineage_output, option=orjson.OPT_INDENT_2))
 
         # Save merge report
         report_file = self.entities_file.parent / 'entity_merge_report.json'
         report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.merge_timestamp,
             'duplicates_found': len(duplicates),
             'entities_before': len(entities),
             'entities_after': len(merged_entities),
-            'entities_merged': len(entities) - len(merged_entities),
+            'entities_merged': len(merge_log),
             'lineage_records_created': len(self.entity_lineages),
             'merge_log': merge_log
         }
 
-        with open(report_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(report_file, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
 
         logging.info(f"✅ Merge with lineage complete")
         logging.info(f"   Duplicates found: {len(duplicates)}")
@@ -126,6 +327,61 @@ class EntityMergeJobWithLineage(EntityMergeJob):
 
         return report
 
+    def _find_duplicates(self, entities: Dict) -> List[Tuple]:
+        """
+        Find duplicate entity pairs by canonical name similarity
+
+        Entities are first bucketed by blocking keys so only names that
+        share a prefix or phonetic code are scored. Similarity is the Indel
+        ratio 2*LCS/total of the lowercased names, from the fastest backend
+        available: rapidfuzz cdist -> numba LCS kernel -> pure-Python LCS.
+        All three give identical scores.
+        Blocks of TFIDF_MIN_BLOCK names or more are pruned to TF-IDF cosine
+        candidates first, and only those are scored.
+        Superseded entities are skipped so re-running a merge is idempotent.
+
+        Returns:
+            List of (id1, id2, similarity), highest similarity first
+        """
+        entity_ids = [
+            entity_id for entity_id, entity in entities.items()
+            if entity.get('status') != 'superseded' and entity.get('canonical_name')
+        ]
+        names = [entities[entity_id]['canonical_name'] for entity_id in entity_ids]
+
+        if RAPIDFUZZ_AVAILABLE:
+            score_pairs = _rapidfuzz_pairs
+        elif NUMBA_AVAILABLE:
+            score_pairs = indel_pairs
+        else:
+            score_pairs = _lcs_pairs
+
+        blocks = defaultdict(list)
+        for index, name in enumerate(names):
+            for key in _blocking_keys(name):
+                blocks[key].append(index)
+
+        # Same pair can appear in several blocks; keep one entry per pair
+        scored = {}
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            block_names = [names[index] for index in members]
+            if SKLEARN_AVAILABLE and len(members) >= TFIDF_MIN_BLOCK:
+                block_pairs = _tfidf_pairs(block_names, self.similarity_threshold)
+            else:
+                block_pairs = score_pairs(block_names, self.similarity_threshold)
+            for i, j, similarity in block_pairs:
+                scored[(members[i], members[j])] = similarity
+
+        duplicates = [
+            (entity_ids[i], entity_ids[j], similarity)
+            for (i, j), similarity in scored.items()
+        ]
+
+        duplicates.sort(key=lambda pair: pair[2], reverse=True)
+        return duplicates
+
     def _merge_duplicates_with_lineage(
         self,
         entities: Dict,
@@ -134,12 +390,19 @@ class EntityMergeJobWithLineage(EntityMergeJob):
         """
         Merge duplicate entities WITH EntityLineage tracking
 
+        Mutates `entities` in place (the caller owns the freshly loaded
+        dict) and returns it.
+
         Returns:
             (merged_entities, merge_log)
         """
-        merged_entities = entities.copy()
+        now = self.merge_timestamp or datetime.now().isoformat()
+        merged_entities = entities
         merge_log = []
-        merged_ids = set()
+
+        merged_ids = set()  # secondaries already merged into a primary
+
+        alias_sets = {}  # entity_id -> alias set while merging
 
         for id1, id2, similarity in duplicates:
             if id1 in merged_ids or id2 in merged_ids:
@@ -163,10 +426,12 @@ class EntityMergeJobWithLineage(EntityMergeJob):
                 primary = entity2
                 secondary = entity1
 
+            merged_ids.add(secondary_id)
+
             # 🆕 CREATE ENTITY LINEAGE RECORD
             lineage = EntityLineage(
                 lineage_id=f"lineage_{self.lineage_counter:06d}",
-                timestamp=datetime.now().isoformat(),
+                timestamp=now,
                 old_entity_id=secondary_id,
                 new_entity_id=primary_id,
                 operation="merge",
@@ -177,20 +442,21 @@ class EntityMergeJobWithLineage(EntityMergeJob):
                 metadata={
                     'merged_canonical_name': secondary.get('canonical_name'),
                     'primary_canonical_name': primary.get('canonical_name'),
-                    'transaction_count_transferred': tx_count2,
+                    'transaction_count_transferred': secondary.get('transaction_count', 0),
                     'amount_transferred': secondary.get('total_amount_usd', 0)
-                }
+                },
+                created_at=now
             )
 
             self.entity_lineages.append(lineage)
             self.lineage_counter += 1
 
-            # Merge data
-            primary['aliases'] = list(set(
-                primary.get('aliases', []) +
-                secondary.get('aliases', []) +
-                [secondary.get('canonical_name', '')]
-            ))
+            # Merge data (aliases accumulate in a set, written back after the loop)
+            primary_aliases = alias_sets.get(primary_id)
+            if primary_aliases is None:
+                primary_aliases = alias_sets[primary_id] = set(primary.get('aliases', ()))
+            primary_aliases.update(alias_sets.get(secondary_id) or secondary.get('aliases', ()))
+            primary_aliases.add(secondary.get('canonical_name', ''))
 
             primary['transaction_count'] = (
                 primary.get('transaction_count', 0) +
@@ -203,45 +469,46 @@ class EntityMergeJobWithLineage(EntityMergeJob):
             )
 
             # Track lineage in entity
-            primary['merged_from'] = primary.get('merged_from', []) + [secondary_id]
-            primary['last_merged'] = datetime.now().isoformat()
+            primary.setdefault('merged_from', []).append(secondary_id)
+            primary['last_merged'] = now
             primary['lineage_id'] = lineage.lineage_id
 
-            # Update merged entities
-            merged_entities[primary_id] = primary
-
             # DON'T DELETE - mark as superseded (preserve history)
             secondary['status'] = 'superseded'
             secondary['superseded_by'] = primary_id
-            secondary['superseded_at'] = datetime.now().isoformat()
-            secondary['lineage_id'] = lineage.lineage_id
-            merged_entities[secondary_id] = secondary  # Keep it!
+            secondary['superseded_at'] = now
+            secondary['lineage_id'] = lineage.lineage_id  # Kept, not deleted
 
             # Log merge
             merge_log.append({
                 'primary': primary_id,
                 'secondary': secondary_id,
                 'similarity': similarity,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now,
                 'lineage_id': lineage.lineage_id
             })
 
+        for entity_id, aliases in alias_sets.items():
+            merged_entities[entity_id]['aliases'] = list(aliases)
+
         return merged_entities, merge_log
 
 
-def main():
+def main(argv=None):
     """CLI for running hybrid entity resolution with lineage"""
 
     base_dir = Path(__file__).parent.parent
+    if argv is None:
+        argv = sys.argv[1:]
 
-    if len(sys.argv) < 2:
+    if len(argv) < 1:
         print("Usage:")
         print("  python hybrid_entity_resolution_with_lineage.py batch   # Run batch pre-clustering")
         print("  python hybrid_entity_resolution_with_lineage.py merge   # Run periodic merge WITH lineage")
         print("  python hybrid_entity_resolution_with_lineage.py test    # Test resolution")
         sys.exit(1)
 
-    command = sys.argv[1]
+    command = argv[0]
 
     if command == 'batch':
         # Phase 1: Batch pre-clustering (same as original)
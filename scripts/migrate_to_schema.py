@@ -8,13 +8,31 @@ Migrates canonical_ledger_v6.json to use the complete StorageSchema with:
 - AttributeFacts for scalar properties
 - RelationshipFacts for connections
 - Full bitemporal tracking and provenance
+
+Output is NDJSON: a "metadata" record on the first line, then one
+{"kind": ..., ...} record per node/fact (see StorageSchema.iter_records).
 """
 
-import json
+import argparse
+import itertools
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+import ijson
+import orjson
+from tqdm import tqdm
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
@@ -28,20 +46,45 @@ from storage.schema import (
 )
 
 
-def generate_statement_id(prefix: str, subject_id: str, predicate: str) -> str:
-    """Generate unique statement ID"""
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-    return f"{prefix}_{subject_id}_{predicate}_{timestamp}"
+# Scalar transaction fields migrated to AttributeFacts:
+# (predicate, object type, value extractor, unit extractor or None)
+SCALAR_FIELDS = (
+    ("amount", "number", lambda tx: float(tx["amount"]), lambda tx: tx.get("currency", "USD")),
+    ("description", "string", itemgetter("description"), None),
+    ("date", "date", itemgetter("date"), None),
+    ("currency", "string", itemgetter("currency"), None),
+    ("category", "string", itemgetter("category"), None),
+)
+
+
+class StatementIdGenerator:
+    """
+    Generate unique statement IDs for one migration run
+
+    IDs end in the run timestamp (formatted once, when the run starts)
+    and a counter that starts at 0 for every run, so repeated runs in
+    one process (e.g. from run_integrated_pipeline.py) never reuse a
+    stale timestamp.
+    """
+    __slots__ = ("run_ts", "_counter")
+
+    def __init__(self, run_ts: Optional[str] = None):
+        self.run_ts = run_ts or datetime.now().strftime("%Y%m%d%H%M%S")
+        self._counter = itertools.count()
 
+    def __call__(self, prefix: str, subject_id: str, predicate: str) -> str:
+        """Generate unique statement ID"""
+        return f"{prefix}_{subject_id}_{predicate}_{self.run_ts}_{next(self._counter)}"
 
-def create_temporal_qualifiers(transaction: Dict[str, Any]) -> TemporalQualifiers:
-    """Create TemporalQualifiers from transaction data"""
+
+def create_temporal_qualifiers(transaction: Dict[str, Any], now_iso: str) -> TemporalQualifiers:
+    """Create TemporalQualifiers from transaction data (now_iso is the fallback time)"""
     # Use transaction date as valid_from
-    valid_from = transaction.get("date", datetime.now().isoformat())
+    valid_from = transaction.get("date", now_iso)
 
     # Use provenance created_at as observed_at
     provenance_data = transaction.get("provenance", {})
-    observed_at = provenance_data.get("created_at", datetime.now().isoformat())
+    observed_at = provenance_data.get("created_at", now_iso)
 
     return TemporalQualifiers(
         valid_from=valid_from,
@@ -51,14 +94,14 @@ def create_temporal_qualifiers(transaction: Dict[str, Any]) -> TemporalQualifier
     )
 
 
-def create_provenance(transaction: Dict[str, Any]) -> Provenance:
-    """Create Provenance from transaction data"""
+def create_provenance(transaction: Dict[str, Any], now_iso: str) -> Provenance:
+    """Create Provenance from transaction data (now_iso is the fallback time)"""
     provenance_data = transaction.get("provenance", {})
 
     observation_ids = provenance_data.get("observation_ids", [])
     source_method = provenance_data.get("source_method", "unknown")
     observer = provenance_data.get("observer", "unknown")
-    created_at = provenance_data.get("created_at", datetime.now().isoformat())
+    created_at = provenance_data.get("created_at", now_iso)
 
     # Get confidence score
     confidence_data = transaction.get("confidence", {})
@@ -82,7 +125,9 @@ def create_provenance(transaction: Dict[str, Any]) -> Provenance:
 def migrate_transaction_to_schema(
     transaction: Dict[str, Any],
     schema: StorageSchema,
-    entity_registry: Dict[str, str]  # merchant_name -> entity_id
+    entity_registry: Dict[str, str],  # merchant_name -> entity_id
+    now_iso: Optional[str] = None,  # Run timestamp, computed once by the caller
+    statement_ids: Optional[StatementIdGenerator] = None  # The run's ID generator
 ) -> None:
     """
     Migrate a single transaction to the schema format
@@ -101,102 +146,49 @@ def migrate_transaction_to_schema(
         event_type=EventType.FINANCE_TRANSACTION,
         happened_at=transaction.get("date", ""),
         status=NodeStatus.VERIFIED,
-        snapshot={
-            "amount": transaction.get("amount"),
-            "currency": transaction.get("currency", "USD"),
-            "description": transaction.get("description")
-        }
+        snapshot={"description": transaction.get("description")},
+        snapshot_amount=transaction.get("amount"),
+        snapshot_currency=transaction.get("currency", "USD")
     )
     schema.add_event(event_node)
 
     # Get temporal and provenance data
-    temporal = create_temporal_qualifiers(transaction)
-    provenance = create_provenance(transaction)
+    if now_iso is None:
+        now_iso = datetime.now().isoformat()
+    if statement_ids is None:
+        statement_ids = StatementIdGenerator()
+    temporal = create_temporal_qualifiers(transaction, now_iso)
+    provenance = create_provenance(transaction, now_iso)
 
     # 2. Create AttributeFacts for scalar properties
+    for predicate, value_type, get_value, get_unit in SCALAR_FIELDS:
+        if predicate not in transaction:
+            continue
 
-    # Amount fact
-    if "amount" in transaction:
-        amount_fact = AttributeFact(
-            statement_id=generate_statement_id("attr", event_id, "amount"),
-            subject_id=event_id,
-            predicate="amount",
-            object={
-                "value": float(transaction["amount"]),
-                "type": "number",
-                "unit": transaction.get("currency", "USD")
-            },
-            temporal=temporal,
-            provenance=provenance
-        )
-        schema.add_attribute_fact(amount_fact)
-
-    # Description fact
-    if "description" in transaction:
-        description_fact = AttributeFact(
-            statement_id=generate_statement_id("attr", event_id, "description"),
-            subject_id=event_id,
-            predicate="description",
-            object={
-                "value": transaction["description"],
-                "type": "string"
-            },
-            temporal=temporal,
-            provenance=provenance
-        )
-        schema.add_attribute_fact(description_fact)
-
-    # Date fact
-    if "date" in transaction:
-        date_fact = AttributeFact(
-            statement_id=generate_statement_id("attr", event_id, "date"),
-            subject_id=event_id,
-            predicate="date",
-            object={
-                "value": transaction["date"],
-                "type": "date"
-            },
-            temporal=temporal,
-            provenance=provenance
-        )
-        schema.add_attribute_fact(date_fact)
-
-    # Currency fact
-    if "currency" in transaction:
-        currency_fact = AttributeFact(
-            statement_id=generate_statement_id("attr", event_id, "currency"),
-            subject_id=event_id,
-            predicate="currency",
-            object={
-                "value": transaction["currency"],
-                "type": "string"
-            },
-            temporal=temporal,
-            provenance=provenance
-        )
-        schema.add_attribute_fact(currency_fact)
+        fact_object = {
+            "value": get_value(transaction),
+            "type": value_type
+        }
+        if get_unit is not None:
+            fact_object["unit"] = get_unit(transaction)
 
-    # Category fact (if present)
-    if "category" in transaction:
-        category_fact = AttributeFact(
-            statement_id=generate_statement_id("attr", event_id, "category"),
+        schema.add_attribute_fact(AttributeFact(
+            statement_id=statement_ids("attr", event_id, predicate),
             subject_id=event_id,
-            predicate="category",
-            object={
-                "value": transaction["category"],
-                "type": "string"
-            },
+            predicate=predicate,
+            object=fact_object,
             temporal=temporal,
             provenance=provenance
-        )
-        schema.add_attribute_fact(category_fact)
+        ))
 
     # 3. Create RelationshipFact for merchant
     if "merchant" in transaction:
         merchant_name = transaction["merchant"]
 
-        # Get or create entity_id for merchant
-        if merchant_name not in entity_registry:
+        # Get or create entity_id for merchant (single lookup on the hit path)
+        entity_id = entity_registry.get(merchant_name)
+        if entity_id is None:
+            merchant_name = sys.intern(merchant_name)
             entity_id = f"ent_merchant_{len(entity_registry)}"
             entity_registry[merchant_name] = entity_id
 
@@ -205,13 +197,13 @@ def migrate_transaction_to_schema(
                 entity_id=entity_id,
                 type=EntityType.MERCHANT,
                 status=NodeStatus.VERIFIED,
-                aliases=[merchant_name]
+                aliases=(merchant_name,)
             )
             schema.add_entity(merchant_entity)
 
             # Add canonical_name as AttributeFact
             canonical_name_fact = AttributeFact(
-                statement_id=generate_statement_id("attr", entity_id, "canonical_name"),
+                statement_id=statement_ids("attr", entity_id, "canonical_name"),
                 subject_id=entity_id,
                 predicate="canonical_name",
                 object={
@@ -223,11 +215,9 @@ def migrate_transaction_to_schema(
             )
             schema.add_attribute_fact(canonical_name_fact)
 
-        entity_id = entity_registry[merchant_name]
-
         # Create RelationshipFact
         merchant_relationship = RelationshipFact(
-            statement_id=generate_statement_id("rel", event_id, "merchant"),
+            statement_id=statement_ids("rel", event_id, "merchant"),
             subject_id=event_id,
             predicate="merchant",
             target_id=entity_id,
@@ -237,67 +227,217 @@ def migrate_transaction_to_schema(
         schema.add_relationship_fact(merchant_relationship)
 
 
-def migrate_canonical_ledger(input_path: Path, output_path: Path) -> None:
+def iter_transactions(input_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream transactions from a canonical ledger one at a time
+
+    Parses incrementally with ijson so the full document is never
+    materialized; numbers are decoded as float (not Decimal).
+    """
+    with open(input_path, 'rb') as f:
+        yield from ijson.items(f, 'transactions.item', use_float=True)
+
+
+# Transactions per worker task when migrating in parallel
+MIGRATION_CHUNK_SIZE = 5000
+
+# Transactions always migrated serially before a worker pool is started.
+# Below this, pool startup, pickling chunk results and renumbering merchant
+# IDs cost more than the work saved (3 workers were ~2.5x slower than
+# serial on a 12k-transaction ledger), so small ledgers never use a pool.
+PARALLEL_MIN_TRANSACTIONS = 50_000
+
+
+def _migrate_chunk(
+    transactions: List[Dict[str, Any]],
+    now_iso: str,
+    run_ts: str
+) -> Tuple[StorageSchema, Dict[str, str]]:
+    """Worker: migrate a chunk into its own schema with a chunk-local merchant registry"""
+    schema = StorageSchema()
+    entity_registry = {}
+    statement_ids = StatementIdGenerator(run_ts)
+    for transaction in transactions:
+        migrate_transaction_to_schema(transaction, schema, entity_registry, now_iso, statement_ids)
+    return schema, entity_registry
+
+
+def _merge_chunk(
+    schema: StorageSchema,
+    entity_registry: Dict[str, str],
+    chunk_schema: StorageSchema,
+    chunk_registry: Dict[str, str],
+    statement_ids: StatementIdGenerator
+) -> None:
+    """
+    Fold a worker chunk into the main schema
+
+    Chunk-local merchant IDs are renumbered against the global registry
+    (first-seen order, same numbering as a serial run). Merchants already
+    known globally drop their duplicate EntityNode and canonical_name fact;
+    new ones get statement IDs from the run's statement_ids.
+    """
+    remap = {}  # chunk entity_id -> global entity_id
+    new_entity_ids = set()
+    for merchant_name, local_id in chunk_registry.items():
+        global_id = entity_registry.get(merchant_name)
+        if global_id is None:
+            global_id = f"ent_merchant_{len(entity_registry)}"
+            entity_registry[sys.intern(merchant_name)] = global_id
+            new_entity_ids.add(local_id)
+        remap[local_id] = global_id
+
+    for node_id, node in chunk_schema.nodes.items():
+        if not isinstance(node, EntityNode):
+            schema.nodes[node_id] = node
+        elif node_id in new_entity_ids:
+            schema.add_entity(replace(node, entity_id=remap[node_id]))
+
+    attribute_facts = []
+    for fact in chunk_schema.attribute_facts:
+        if fact.subject_id not in remap:
+            attribute_facts.append(fact)
+        elif fact.subject_id in new_entity_ids:
+            global_id = remap[fact.subject_id]
+            attribute_facts.append(replace(
+                fact,
+                statement_id=statement_ids("attr", global_id, fact.predicate),
+                subject_id=global_id
+            ))
+    schema.add_attribute_facts(attribute_facts)
+
+    schema.add_relationship_facts([
+        replace(fact, target_id=remap[fact.target_id]) if fact.target_id in remap else fact
+        for fact in chunk_schema.relationship_facts
+    ])
+
+
+def _migrate_parallel(
+    transactions: Iterable[Dict[str, Any]],
+    schema: StorageSchema,
+    entity_registry: Dict[str, str],
+    now_iso: str,
+    statement_ids: StatementIdGenerator,
+    workers: int
+) -> None:
+    """
+    Migrate transactions across worker processes
+
+    The first PARALLEL_MIN_TRANSACTIONS are migrated serially in this
+    process; only the remainder, if any, goes to the pool. Chunks are
+    submitted with a bounded window (2 per worker) so the input stream
+    is never fully materialized; results are merged in submission order.
+    """
+    transactions = iter(transactions)
+    for transaction in itertools.islice(transactions, PARALLEL_MIN_TRANSACTIONS):
+        migrate_transaction_to_schema(transaction, schema, entity_registry, now_iso, statement_ids)
+
+    chunks = iter(lambda: list(itertools.islice(transactions, MIGRATION_CHUNK_SIZE)), [])
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        return
+    chunks = itertools.chain([first_chunk], chunks)
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            pending.append(executor.submit(_migrate_chunk, chunk, now_iso, statement_ids.run_ts))
+            if len(pending) >= 2 * workers:
+                _merge_chunk(schema, entity_registry, *pending.popleft().result(), statement_ids)
+
+        while pending:
+            _merge_chunk(schema, entity_registry, *pending.popleft().result(), statement_ids)
+
+
+def _write_ndjson(f, metadata: Dict[str, Any], schema: StorageSchema) -> None:
+    """Write the metadata line followed by one record per line"""
+    f.write(orjson.dumps(metadata))
+    f.write(b"\n")
+    for kind, record in schema.iter_records():
+        f.write(orjson.dumps({"kind": kind, **record}))
+        f.write(b"\n")
+
+
+def migrate_canonical_ledger(
+    input_path: Path,
+    output_path: Path,
+    workers: int = 1,
+    compress: bool = False
+) -> None:
     """
     Migrate canonical ledger to full schema format
+
+    workers > 1 migrates chunks in a process pool once the ledger exceeds
+    PARALLEL_MIN_TRANSACTIONS (see _migrate_parallel).
+    compress=True writes <output_path>.zst through a streaming zstd
+    compressor instead of plain NDJSON.
     """
+    if compress:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required for compressed output (pip install zstandard)")
+        output_path = output_path.with_name(output_path.name + ".zst")
+
     print(f"🔄 Migrando canonical ledger...")
     print(f"  Input: {input_path}")
     print(f"  Output: {output_path}")
     print()
 
-    # Load canonical ledger
-    with open(input_path, 'r') as f:
-        canonical_data = json.load(f)
-
-    transactions = canonical_data.get("transactions", [])
-    print(f"📊 Transacciones a migrar: {len(transactions)}")
-    print()
-
     # Create schema
     schema = StorageSchema()
     entity_registry = {}
-
-    # Migrate each transaction
-    for i, transaction in enumerate(transactions, 1):
-        if i % 500 == 0:
-            print(f"  Procesando: {i}/{len(transactions)}...")
-
-        migrate_transaction_to_schema(transaction, schema, entity_registry)
+    now = datetime.now()
+    now_iso = now.isoformat()
+    statement_ids = StatementIdGenerator(now.strftime("%Y%m%d%H%M%S"))
+
+    # Stream and migrate each transaction (tqdm reports progress on stderr)
+    transactions = tqdm(iter_transactions(input_path), desc="  Procesando", unit="tx")
+    if workers > 1:
+        _migrate_parallel(transactions, schema, entity_registry, now_iso, statement_ids, workers)
+    else:
+        for transaction in transactions:
+            migrate_transaction_to_schema(transaction, schema, entity_registry, now_iso, statement_ids)
+    transaction_count = transactions.n
 
+    print()
+    print(f"📊 Transacciones migradas: {transaction_count}")
     print()
     print("✅ Migración completa!")
     print()
+    event_count = sum(1 for n in schema.nodes.values() if isinstance(n, EventNode))
+    entity_count = sum(1 for n in schema.nodes.values() if isinstance(n, EntityNode))
+
     print("📊 Estadísticas:")
     print(f"  Nodes: {len(schema.nodes)}")
-    print(f"    - Events: {sum(1 for n in schema.nodes.values() if isinstance(n, EventNode))}")
-    print(f"    - Entities: {sum(1 for n in schema.nodes.values() if isinstance(n, EntityNode))}")
+    print(f"    - Events: {event_count}")
+    print(f"    - Entities: {entity_count}")
     print(f"  AttributeFacts: {len(schema.attribute_facts)}")
     print(f"  RelationshipFacts: {len(schema.relationship_facts)}")
     print()
 
-    # Export to JSON
-    schema_dict = schema.to_dict()
-
-    # Add metadata
-    output_data = {
-        "generated_at": datetime.now().isoformat(),
+    # Metadata header (first NDJSON line)
+    metadata = {
+        "kind": "metadata",
+        "generated_at": now_iso,
         "source": "canonical_ledger_v6",
         "schema_version": "1.0",
         "description": "Full schema migration with EventNodes, AttributeFacts, and RelationshipFacts",
         "statistics": {
             "total_nodes": len(schema.nodes),
-            "event_nodes": sum(1 for n in schema.nodes.values() if isinstance(n, EventNode)),
-            "entity_nodes": sum(1 for n in schema.nodes.values() if isinstance(n, EntityNode)),
+            "event_nodes": event_count,
+            "entity_nodes": entity_count,
             "attribute_facts": len(schema.attribute_facts),
             "relationship_facts": len(schema.relationship_facts)
-        },
-        **schema_dict
+        }
     }
 
-    # Save
-    with open(output_path, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    # Save as NDJSON, one record per line (optionally zstd-compressed)
+    with open(output_path, 'wb') as raw:
+        if compress:
+            cctx = zstd.ZstdCompressor(level=3, threads=-1)
+            with cctx.stream_writer(raw) as f:
+                _write_ndjson(f, metadata, schema)
+        else:
+            _write_ndjson(raw, metadata, schema)
 
     print(f"💾 Guardado en: {output_path}")
     print(f"📦 Tamaño: {output_path.stat().st_size / 1024 / 1024:.2f} MB")
@@ -305,11 +445,25 @@ def migrate_canonical_ledger(input_path: Path, output_path: Path) -> None:
     print("🎉 ¡Migración completada con éxito!")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    """CLI entry point (also called in-process by run_integrated_pipeline.py)"""
     # Paths
     base_dir = Path(__file__).parent.parent
     input_path = base_dir / "data" / "canonical" / "canonical_ledger_v6.json"
-    output_path = base_dir / "data" / "canonical" / "canonical_ledger_schema_v1.json"
+    output_path = base_dir / "data" / "canonical" / "canonical_ledger_schema_v1.ndjson"
+
+    parser = argparse.ArgumentParser(description="Migrate canonical ledger to StorageSchema")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for migration (default: 1, serial); "
+                             f"only used past the first {PARALLEL_MIN_TRANSACTIONS:,} transactions, "
+                             "so it pays off on large ledgers only")
+    parser.add_argument("--zstd", action="store_true",
+                        help="Write zstd-compressed NDJSON (<output>.zst)")
+    args = parser.parse_args(argv)
 
     # Run migration
-    migrate_canonical_ledger(input_path, output_path)
+    migrate_canonical_ledger(input_path, output_path, workers=args.workers, compress=args.zstd)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,26 @@ Extends reconcile_field_level.py to create ReconciliationDecision objects
 for full auditability and compliance with Objective Layer framework.
 """
 
-import json
+import argparse
+import hashlib
+import itertools
+import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+import ijson
+import orjson
+from ijson.common import ObjectBuilder
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from storage.schema import ReconciliationDecision, StorageSchema
+from storage.schema import FieldStrategy, ReconciliationDecision, StorageSchema
 
 # Import reconciliation engine
 from reconcile_field_level import (
@@ -24,6 +34,12 @@ from reconcile_field_level import (
     SOURCE_PRIORITY
 )
 
+# ijson's C backend (yajl2_c); falls back to the fastest one installed
+try:
+    ijson = ijson.get_backend('yajl2_c')
+except ImportError:
+    pass
+
 try:
     from reconciliation_strategies import create_default_registry
     PLUGGABLE_STRATEGIES_AVAILABLE = True
@@ -32,63 +48,344 @@ except ImportError:
     create_default_registry = None
 
 
+# Top-level observation arrays in priority order: immutable observation
+# layer, then legacy ledger formats
+OBSERVATION_PREFIXES = ('observations', 'all_transactions', 'transactions')
+
+# Read buffer for streamed JSON inputs
+JSON_READ_BUFFER = 1 << 20
+
+# orjson options for output files (indented, like the previous json.dump)
+JSON_WRITE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Reconciled fields, in schema order (hoisted out of the per-decision loop)
+FIELD_SCHEMA_KEYS = tuple(FIELD_SCHEMA.keys())
+
+# Most payloads kept in a single-source reconciliation cache (least
+# recently used are evicted first)
+RECON_CACHE_MAXSIZE = 100_000
+
+# Shared by every FieldStrategy with no rejected alternatives
+_NO_ALTERNATIVES = ()
+
+
+def iter_observations(observations_file: Path) -> Iterator[Tuple[str, Dict]]:
+    """
+    Stream observations one at a time from the highest-priority array
+
+    The array is picked as the old one-shot load did, whatever the key
+    order in the document: 'observations' if present (even when empty),
+    else a non-empty 'all_transactions', else 'transactions'. A first
+    ijson pass only looks at top-level keys to choose it; the second
+    pass yields (key, observation) for its items (a non-array value
+    yields nothing). Numbers are decoded as float (not Decimal).
+    """
+    with open(observations_file, 'rb', buffering=JSON_READ_BUFFER) as f:
+        key = _select_observation_key(ijson.parse(f))
+        if key is None:
+            return
+
+        f.seek(0)
+        events = ijson.parse(f, use_float=True)
+        for prefix, event, value in events:
+            if prefix or event != 'map_key' or value != key:
+                continue
+            if next(events)[1] == 'start_array':
+                for obs in _iter_array_items(events, key):
+                    yield key, obs
+            return
+
+
+def _select_observation_key(events: Iterator[Tuple[str, str, Any]]) -> Optional[str]:
+    """Pick the observation array key by OBSERVATION_PREFIXES priority from an ijson event stream"""
+    # key -> whether its value is a non-empty array
+    non_empty = {}
+    for prefix, event, value in events:
+        if prefix or event != 'map_key' or value not in OBSERVATION_PREFIXES:
+            continue
+        if value == 'observations':
+            return value
+        non_empty[value] = next(events)[1] == 'start_array' and next(events)[1] != 'end_array'
+
+    if non_empty.get('all_transactions'):
+        return 'all_transactions'
+    if 'transactions' in non_empty:
+        return 'transactions'
+    return None
+
+
+def _iter_array_items(events: Iterator[Tuple[str, str, Any]], key: str) -> Iterator[Any]:
+    """Build the items of top-level array key from an ijson event stream (after its start_array)"""
+    item_prefix = f'{key}.item'
+    for prefix, event, value in events:
+        if prefix != item_prefix:
+            # Only the array's own end_array is not under item_prefix
+            return
+        if event not in ('start_map', 'start_array'):
+            yield value
+            continue
+
+        builder = ObjectBuilder()
+        depth = 1
+        while depth:
+            builder.event(event, value)
+            _, event, value = next(events)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+        yield builder.value
+
+
+class StreamingJsonWriter:
+    """
+    Write {header..., array_key: [items...]} one item at a time
+
+    Output is byte-identical to a one-shot orjson.dumps(..., JSON_WRITE_OPTIONS)
+    of the same object. The header (including any counts in it) is written
+    up front, so item_count must be known before the first write; on close
+    the array is terminated and the .tmp file is moved into place, or
+    removed if fewer or more than item_count items were written.
+    """
+
+    def __init__(self, path: Path, header: Dict[str, Any], array_key: str, item_count: int):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + '.tmp')
+        self.header = header
+        self.array_key = array_key
+        self.item_count = item_count
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'StreamingJsonWriter':
+        f = self._file = open(self.tmp_path, 'wb', buffering=JSON_READ_BUFFER)
+        f.write(b'{')
+        for key, value in self.header.items():
+            f.write(b'\n  ' + orjson.dumps(key) + b': ')
+            f.write(_indent(orjson.dumps(value, option=JSON_WRITE_OPTIONS), b'  '))
+            f.write(b',')
+        f.write(b'\n  ' + orjson.dumps(self.array_key) + b': [')
+        return self
+
+    def write(self, item: Any):
+        """Append one item to the array"""
+        if self.count:
+            self._file.write(b',')
+        self._file.write(b'\n    ' + _indent(orjson.dumps(item, option=JSON_WRITE_OPTIONS), b'    '))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None and self.count == self.item_count:
+            self._file.write(b'\n  ]\n}' if self.count else b']\n}')
+            self._file.close()
+            os.replace(self.tmp_path, self.path)
+            return False
+
+        self._file.close()
+        os.unlink(self.tmp_path)
+        if exc_type is None:
+            raise ValueError(
+                f"{self.path.name}: wrote {self.count} items, header declares {self.item_count}"
+            )
+        return False
+
+
+def _indent(data: bytes, prefix: bytes) -> bytes:
+    """Indent every continuation line of an orjson-indented document"""
+    return data.replace(b'\n', b'\n' + prefix)
+
+
+# An ingested observation: (observation ID, data source, payload). Both are
+# resolved once at ingest and kept beside the payload, so the dict handed to
+# reconcile_observations is exactly the one read from the input file.
+ObservationRecord = Tuple[Optional[str], str, Dict]
+
+
+def resolve_data_source(obs: Dict) -> str:
+    """
+    Data source of an observation: 'data_source' if present, otherwise
+    the observer name without its version suffix ("x_v2" -> "x")
+
+    The observer split only runs when it is needed (a .get() default
+    would be evaluated eagerly for every observation).
+    """
+    if 'data_source' in obs:
+        return obs['data_source']
+    return obs.get('observer', 'unknown').split('_v', 1)[0]
+
+
+def observation_cache_key(obs: Dict, id_field: str) -> bytes:
+    """Semantic hash of an observation's payload, ignoring the value of its ID field"""
+    payload = dict(obs)
+    payload[id_field] = None
+    encoded = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def _id_slots(a: Any, b: Any, id_a: str, id_b: str, path: Tuple = ()) -> Optional[List[Tuple]]:
+    """
+    Locate the observation-ID-bearing values of a canonical
+
+    a and b are the canonicals reconciled from two observations that
+    differ only in their IDs (id_a, id_b). Returns the (path, prefix,
+    suffix) of every string where a == prefix + id_a + suffix and
+    b == prefix + id_b + suffix, or None if some difference is not
+    explained by the ID (the payload cannot be templated).
+    """
+    if type(a) is not type(b):
+        return None
+    if isinstance(a, dict):
+        if list(a) != list(b):
+            return None
+        slots = []
+        for key, value in a.items():
+            found = _id_slots(value, b[key], id_a, id_b, path + (key,))
+            if found is None:
+                return None
+            slots.extend(found)
+        return slots
+    if isinstance(a, list):
+        if len(a) != len(b):
+            return None
+        slots = []
+        for position, (value_a, value_b) in enumerate(zip(a, b)):
+            found = _id_slots(value_a, value_b, id_a, id_b, path + (position,))
+            if found is None:
+                return None
+            slots.extend(found)
+        return slots
+    if a == b:
+        return []
+    if isinstance(a, str):
+        start = a.find(id_a)
+        while start != -1:
+            prefix, suffix = a[:start], a[start + len(id_a):]
+            if prefix + id_b + suffix == b:
+                return [(path, prefix, suffix)]
+            start = a.find(id_a, start + 1)
+    return None
+
+
+def reconcile_single_cached(
+    record: ObservationRecord,
+    strategy_registry,
+    recon_cache: Dict[bytes, Any],
+    maxsize: int = RECON_CACHE_MAXSIZE
+) -> Dict:
+    """
+    Reconcile a single observation, reusing results for repeated payloads
+
+    recon_cache maps observation_cache_key -> state. The first two
+    observations with a payload are reconciled normally; comparing their
+    canonicals locates the values that carry the observation ID (e.g. id,
+    source_observation_id), and later hits decode the cached canonical
+    and rewrite only those values. Payloads whose canonicals differ in
+    any other way are never templated.
+
+    The cache holds at most maxsize payloads: dict order is kept as
+    recency order, and the least recently used entry is evicted.
+    """
+    obs_id, _, obs = record
+    if not obs_id or not isinstance(obs_id, str):
+        return reconcile_observations([obs], strategy_registry)
+
+    id_field = 'observation_id' if obs.get('observation_id') else 'id'
+    key = observation_cache_key(obs, id_field)
+
+    cached = recon_cache.pop(key, None)
+    if cached is not None:
+        recon_cache[key] = cached  # Move to most recently used
+    if cached is not None and cached[0] == 'template':
+        _, encoded, slots = cached
+        canonical = orjson.loads(encoded)
+        for path, prefix, suffix in slots:
+            target = canonical
+            for step in path[:-1]:
+                target = target[step]
+            target[path[-1]] = prefix + obs_id + suffix
+        return canonical
+
+    canonical = reconcile_observations([obs], strategy_registry)
+    if cached is None:
+        if len(recon_cache) >= maxsize:
+            del recon_cache[next(iter(recon_cache))]
+        recon_cache[key] = ('first', obs_id, orjson.dumps(canonical, option=orjson.OPT_NON_STR_KEYS))
+    elif cached[0] == 'first' and cached[1] != obs_id:
+        _, first_id, encoded = cached
+        slots = _id_slots(orjson.loads(encoded), canonical, first_id, obs_id)
+        recon_cache[key] = ('uncacheable',) if slots is None else ('template', encoded, slots)
+    return canonical
+
+
 def create_reconciliation_decision(
-    observations: List[Dict],
+    records: List[ObservationRecord],
     canonical: Dict,
-    decision_counter: int
+    decision_counter: int,
+    batch_timestamp: Optional[str] = None
 ) -> ReconciliationDecision:
     """
     Create ReconciliationDecision object from reconciliation result
 
     Args:
-        observations: Input observations that were reconciled
+        records: (observation ID, data source, payload) of each
+            observation that was reconciled
         canonical: Output canonical transaction
         decision_counter: Counter for unique decision IDs
+        batch_timestamp: ISO time shared by every decision in the run
+            (defaults to now)
 
     Returns:
         ReconciliationDecision object
     """
+    if batch_timestamp is None:
+        batch_timestamp = datetime.now().isoformat()
+
     # Extract observation IDs
-    obs_ids = [obs.get('observation_id') or obs.get('id') for obs in observations]
+    obs_ids = [obs_id for obs_id, _, _ in records]
 
     # Build cluster metadata from observations
     cluster_metadata = {
-        'observation_count': len(observations),
-        'data_sources': list(set(obs.get('data_source', obs.get('observer', 'unknown').split('_v')[0]) for obs in observations)),
-        'reconciliation_timestamp': datetime.now().isoformat()
+        'observation_count': len(records),
+        'data_sources': list({source for _, source, _ in records}),
+        'reconciliation_timestamp': batch_timestamp
     }
 
     # Build field-level strategies from canonical transaction
+    # (hot loop: locals bound once, schema order kept for stable output)
+    canonical_id = canonical['id']
+    canonical_get = canonical.get
     field_strategies = {}
     created_statement_ids = []
-
-    for field_name in FIELD_SCHEMA.keys():
-        if field_name in canonical:
-            field_data = canonical[field_name]
-
-            # Handle both dict and non-dict field values
-            if isinstance(field_data, dict):
-                strategy = field_data.get('reconciliation_method', 'unknown')
-                chosen_obs = field_data.get('source_observation_id', 'unknown')
-                confidence = field_data.get('confidence', 1.0)
-
-                field_strategies[field_name] = {
-                    'strategy': strategy,
-                    'chosen_obs': chosen_obs,
-                    'confidence': confidence,
-                    'alternatives': field_data.get('alternatives', [])
-                }
-
-                # Generate statement ID for this field
-                statement_id = f"attr_{canonical['id']}_{field_name}"
-                created_statement_ids.append(statement_id)
-
-    # Calculate overall confidence (average of field confidences)
-    confidences = [fs['confidence'] for fs in field_strategies.values() if 'confidence' in fs]
-    overall_confidence = sum(confidences) / len(confidences) if confidences else 1.0
+    append_statement_id = created_statement_ids.append
+    confidence_sum = 0
+    confidence_count = 0
+
+    for field_name in FIELD_SCHEMA_KEYS:
+        field_data = canonical_get(field_name)
+
+        # Only dict-valued fields carry reconciliation metadata
+        if not isinstance(field_data, dict):
+            continue
+
+        field_data_get = field_data.get
+        confidence = field_data_get('confidence', 1.0)
+        field_strategies[field_name] = FieldStrategy(
+            field_data_get('reconciliation_method', 'unknown'),
+            field_data_get('source_observation_id', 'unknown'),
+            confidence,
+            field_data_get('alternatives') or _NO_ALTERNATIVES
+        )
+        confidence_sum += confidence
+        confidence_count += 1
+
+        # Statement ID for this field
+        append_statement_id(f"attr_{canonical_id}_{field_name}")
+
+    # Overall confidence (average of field confidences, accumulated above)
+    overall_confidence = confidence_sum / confidence_count if confidence_count else 1.0
 
     # Determine decision method
-    if len(observations) == 1:
+    if len(records) == 1:
         decision_method = "single_source"
     else:
         decision_method = "automated"
@@ -96,22 +393,146 @@ def create_reconciliation_decision(
     # Create ReconciliationDecision object
     decision = ReconciliationDecision(
         decision_id=f"recon_decision_{decision_counter:06d}",
-        timestamp=datetime.now().isoformat(),
+        timestamp=batch_timestamp,
         observation_ids=obs_ids,
         cluster_metadata=cluster_metadata,
         field_strategies=field_strategies,
         created_statement_ids=created_statement_ids,
         confidence=overall_confidence,
-        decision_method=decision_method
+        decision_method=decision_method,
+        created_at=batch_timestamp
     )
 
     return decision
 
 
-def main():
+def reconcile_one(
+    records: List[ObservationRecord],
+    strategy_registry,
+    decision_counter: int,
+    batch_timestamp: str,
+    recon_cache: Optional[Dict[bytes, Any]] = None
+) -> Tuple[Dict, ReconciliationDecision]:
+    """
+    Reconcile one overlap group (or singleton) and build its decision
+
+    Singletons go through reconcile_single_cached when a recon_cache is
+    given. The canonical is linked to its decision before returning.
+    """
+    if recon_cache is not None and len(records) == 1:
+        canonical = reconcile_single_cached(records[0], strategy_registry, recon_cache)
+    else:
+        canonical = reconcile_observations([obs for _, _, obs in records], strategy_registry)
+
+    decision = create_reconciliation_decision(
+        records,
+        canonical,
+        decision_counter,
+        batch_timestamp
+    )
+
+    # Link decision to canonical transaction
+    canonical['reconciliation_decision_id'] = decision.decision_id
+
+    return canonical, decision
+
+
+def iter_group_observations(
+    overlap_groups: List[Dict],
+    obs_by_id: Dict[str, ObservationRecord],
+    processed_obs_ids: set
+) -> Iterator[List[ObservationRecord]]:
+    """Yield the known observation records of each non-empty overlap group, marking them processed"""
+    for group in overlap_groups:
+        group_observations = []
+        for obs_id in group['observation_ids']:
+            if obs_id in obs_by_id:
+                group_observations.append(obs_by_id[obs_id])
+                processed_obs_ids.add(obs_id)
+
+        if group_observations:
+            yield group_observations
+
+
+# Overlap groups / singletons per worker task when reconciling in parallel
+RECONCILE_CHUNK_SIZE = 1000
+
+# Per-process state for worker processes (see _init_worker)
+_worker_registry = None
+_worker_recon_cache = {}
+
+
+def _init_worker():
+    """Worker initializer: build the strategy registry once per process (it is not picklable)"""
+    global _worker_registry
+    if PLUGGABLE_STRATEGIES_AVAILABLE:
+        try:
+            _worker_registry = create_default_registry()
+        except Exception:
+            _worker_registry = None
+
+
+def _reconcile_chunk(
+    chunk: List[List[ObservationRecord]],
+    first_counter: int,
+    batch_timestamp: str,
+    use_cache: bool
+) -> List[Tuple[Dict, ReconciliationDecision]]:
+    """Worker: reconcile a chunk, numbering decisions from first_counter"""
+    recon_cache = _worker_recon_cache if use_cache else None
+    return [
+        reconcile_one(records, _worker_registry, counter, batch_timestamp, recon_cache)
+        for counter, records in enumerate(chunk, first_counter)
+    ]
+
+
+def iter_reconciled(
+    work: Iterable[List[ObservationRecord]],
+    strategy_registry,
+    first_counter: int,
+    batch_timestamp: str,
+    executor: Optional[ProcessPoolExecutor] = None,
+    workers: int = 1,
+    use_cache: bool = False
+) -> Iterator[Tuple[Dict, ReconciliationDecision]]:
+    """
+    Yield (canonical, decision) for each record list in work, in order
+
+    Without an executor this runs in-process. With one, work is cut into
+    RECONCILE_CHUNK_SIZE chunks submitted with a bounded window (2 per
+    worker). Decision IDs are fixed at submit time from each chunk's
+    position, so numbering matches a serial run.
+    """
+    if executor is None:
+        recon_cache = {} if use_cache else None
+        for counter, records in enumerate(work, first_counter):
+            yield reconcile_one(records, strategy_registry, counter, batch_timestamp, recon_cache)
+        return
+
+    work = iter(work)
+    chunks = iter(lambda: list(itertools.islice(work, RECONCILE_CHUNK_SIZE)), [])
+    pending = deque()
+    counter = first_counter
+
+    for chunk in chunks:
+        pending.append(executor.submit(_reconcile_chunk, chunk, counter, batch_timestamp, use_cache))
+        counter += len(chunk)
+        if len(pending) >= 2 * workers:
+            yield from pending.popleft().result()
+
+    while pending:
+        yield from pending.popleft().result()
+
+
+def main(argv=None):
     """
     Process raw ledger with field-level reconciliation + ReconciliationDecision tracking
     """
+    parser = argparse.ArgumentParser(description="Field-level reconciliation with ReconciliationDecision tracking")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for reconciliation (default: 1, serial)")
+    args = parser.parse_args(argv)
+
     base_dir = Path(__file__).parent.parent
 
     # Load observations
@@ -126,27 +547,33 @@ def main():
         return
 
     print(f"📂 Loading observations: {observations_file.name}")
-    with open(observations_file) as f:
-        obs_data = json.load(f)
 
-    # Handle different formats
-    if 'observations' in obs_data:
-        observations = obs_data['observations']
-        print(f"📊 Found {len(observations)} observations (immutable observation layer)\n")
-    else:
-        observations = obs_data.get('all_transactions') or obs_data.get('transactions', [])
-        print(f"📊 Found {len(observations)} observations (legacy format)\n")
+    # Stream observations, building the record list and the ID index in one pass
+    records = []
+    obs_by_id = {}
+    source_format = None
+    for source_format, obs in iter_observations(observations_file):
+        # Resolve the observation ID (legacy ledgers use 'id') and data
+        # source once at ingest, keeping them beside the payload
+        obs_id = obs.get('observation_id') or obs.get('id')
+        record = (obs_id, resolve_data_source(obs), obs)
+
+        records.append(record)
+        if obs_id:
+            obs_by_id[obs_id] = record
 
-    transactions = observations
+    if source_format == 'observations':
+        print(f"📊 Found {len(records)} observations (immutable observation layer)\n")
+    else:
+        print(f"📊 Found {len(records)} observations (legacy format)\n")
 
     # Load overlap groups
     overlap_file = base_dir / 'data' / 'canonical' / 'overlap_groups.json'
 
     if overlap_file.exists():
         print("📂 Loading overlap groups...")
-        with open(overlap_file) as f:
-            overlap_data = json.load(f)
-        overlap_groups = overlap_data.get('overlap_groups', [])
+        with open(overlap_file, 'rb', buffering=JSON_READ_BUFFER) as f:
+            overlap_groups = list(ijson.items(f, 'overlap_groups.item', use_float=True))
         print(f"   Found {len(overlap_groups)} overlap groups\n")
     else:
         print("⚠️  No overlap groups found. Run detect_overlaps.py first.\n")
@@ -161,124 +588,124 @@ def main():
         except Exception as e:
             print(f"⚠️  Could not initialize strategy registry: {e}\n")
 
-    # Create observation index
-    obs_by_id = {}
-    for obs in transactions:
-        obs_id = obs.get('observation_id') or obs.get('id')
-        if obs_id:
-            obs_by_id[obs_id] = obs
-
-    # Track processed observations
+    # Partition observations up front so the output headers can carry
+    # their final counts: overlap groups first, then the observations no
+    # group claimed. Both lists only reference the ingested records.
     processed_obs_ids = set()
+    group_records = list(iter_group_observations(overlap_groups, obs_by_id, processed_obs_ids))
+    # Walk the ingest list so duplicate-ID observations are all kept
+    # (iterating obs_by_id.keys() - processed_obs_ids would drop them)
+    single_records = [record for record in records if record[0] not in processed_obs_ids]
+    total_count = len(group_records) + len(single_records)
 
     print("🔄 Reconciling observations with ReconciliationDecision tracking...\n")
 
-    canonical_transactions = []
-    reconciliation_decisions = []
-    decision_counter = 0
-
-    # Process overlap groups (multi-source reconciliation)
-    for group in overlap_groups:
-        group_obs_ids = group['observation_ids']
+    # Every decision and output header in this run shares one batch timestamp
+    batch_timestamp = datetime.now().isoformat()
 
-        # Get all observations in this group
-        group_observations = []
-        for obs_id in group_obs_ids:
-            if obs_id in obs_by_id:
-                group_observations.append(obs_by_id[obs_id])
-                processed_obs_ids.add(obs_id)
-
-        if group_observations:
-            # Multi-source reconciliation
-            canonical = reconcile_observations(group_observations, strategy_registry)
-
-            # Create ReconciliationDecision
-            decision = create_reconciliation_decision(
-                group_observations,
-                canonical,
-                decision_counter
-            )
-            decision_counter += 1
+    decision_counter = 0
 
-            # Link decision to canonical transaction
-            canonical['reconciliation_decision_id'] = decision.decision_id
+    # Outputs are streamed as decisions are made
+    output_dir = base_dir / 'data' / 'canonical'
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-            canonical_transactions.append(canonical)
-            reconciliation_decisions.append(decision)
+    canonical_file = output_dir / 'canonical_ledger_with_decisions.json'
+    canonical_writer = StreamingJsonWriter(
+        canonical_file,
+        {
+            'generated_at': batch_timestamp,
+            'version': '6.0',
+            'reconciliation_type': 'field_level_with_decisions',
+            'schema_version': FIELD_SCHEMA,
+            'transaction_count': total_count,
+            'decision_count': total_count,
+        },
+        'transactions',
+        total_count
+    )
 
-            # Show progress for first few
-            if len(canonical_transactions) <= 3:
-                print(f"✅ Multi-source reconciliation: {canonical['id']}")
-                print(f"   Decision ID: {decision.decision_id}")
-                print(f"   Sources: {canonical['reconciliation_metadata']['data_sources']}")
-                print(f"   Field strategies: {len(decision.field_strategies)}")
-                print()
+    decisions_file = output_dir / 'reconciliation_decisions.json'
+    decisions_writer = StreamingJsonWriter(
+        decisions_file,
+        {
+            'generated_at': batch_timestamp,
+            'version': '1.0',
+            'decision_count': total_count,
+        },
+        # orjson serializes the ReconciliationDecision dataclasses natively
+        'decisions',
+        total_count
+    )
 
-    # Process single-source observations
-    single_source_count = 0
-    for obs in transactions:
-        obs_id = obs.get('observation_id') or obs.get('id')
-        if obs_id not in processed_obs_ids:
-            canonical = reconcile_observations([obs], strategy_registry)
-
-            # Create ReconciliationDecision (even for single-source)
-            decision = create_reconciliation_decision(
-                [obs],
-                canonical,
-                decision_counter
-            )
+    # Serial by default; with --workers N, reconcile across N processes
+    if args.workers > 1:
+        pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker)
+    else:
+        pool = nullcontext()
+
+    with canonical_writer, decisions_writer, pool as executor:
+        # Process overlap groups (multi-source reconciliation)
+        group_results = iter_reconciled(
+            group_records,
+            strategy_registry,
+            decision_counter,
+            batch_timestamp,
+            executor,
+            args.workers
+        )
+        sample_log = []
+        for canonical, decision in group_results:
             decision_counter += 1
 
-            # Link decision to canonical transaction
-            canonical['reconciliation_decision_id'] = decision.decision_id
+            canonical_writer.write(canonical)
+            decisions_writer.write(decision)
+
+            # Show progress for first few (written once after the loop)
+            if decision_counter <= 3:
+                sources = canonical.get('reconciliation_metadata', {}).get('data_sources', [])
+                sample_log.append(
+                    f"✅ Multi-source reconciliation: {canonical['id']}\n"
+                    f"   Decision ID: {decision.decision_id}\n"
+                    f"   Sources: {sources}\n"
+                    f"   Field strategies: {len(decision.field_strategies)}\n\n"
+                )
+        sys.stdout.write(''.join(sample_log))
+
+        # Process single-source observations
+
+        # ReconciliationDecision is created even for single-source
+        single_source_count = 0
+        sample_log = []
+        single_results = iter_reconciled(
+            ([record] for record in single_records),
+            strategy_registry,
+            decision_counter,
+            batch_timestamp,
+            executor,
+            args.workers,
+            use_cache=True
+        )
+        for canonical, decision in single_results:
+            decision_counter += 1
 
-            canonical_transactions.append(canonical)
-            reconciliation_decisions.append(decision)
+            canonical_writer.write(canonical)
+            decisions_writer.write(decision)
             single_source_count += 1
 
             if single_source_count <= 3:
-                print(f"✅ Single-source: {canonical['id']}")
-                print(f"   Decision ID: {decision.decision_id}")
-                print()
-
-    # Save outputs
-    output_dir = base_dir / 'data' / 'canonical'
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Save canonical ledger
-    canonical_file = output_dir / 'canonical_ledger_with_decisions.json'
-    canonical_output = {
-        'generated_at': datetime.now().isoformat(),
-        'version': '6.0',
-        'reconciliation_type': 'field_level_with_decisions',
-        'schema_version': FIELD_SCHEMA,
-        'transaction_count': len(canonical_transactions),
-        'decision_count': len(reconciliation_decisions),
-        'transactions': canonical_transactions
-    }
-
-    with open(canonical_file, 'w') as f:
-        json.dump(canonical_output, f, indent=2)
-
-    # Save reconciliation decisions
-    decisions_file = output_dir / 'reconciliation_decisions.json'
-    decisions_output = {
-        'generated_at': datetime.now().isoformat(),
-        'version': '1.0',
-        'decision_count': len(reconciliation_decisions),
-        'decisions': [d.to_dict() for d in reconciliation_decisions]
-    }
-
-    with open(decisions_file, 'w') as f:
-        json.dump(decisions_output, f, indent=2)
+                sample_log.append(
+                    f"✅ Single-source: {canonical['id']}\n"
+                    f"   Decision ID: {decision.decision_id}\n\n"
+                )
+        sys.stdout.write(''.join(sample_log))
 
     print(f"\n✅ Reconciliation with decisions complete!")
     print(f"\n📊 Output Files:")
     print(f"   Canonical ledger: {canonical_file}")
     print(f"   Reconciliation decisions: {decisions_file}")
     print(f"\n📈 Statistics:")
-    print(f"   Total canonical transactions: {len(canonical_transactions)}")
-    print(f"   ReconciliationDecisions created: {len(reconciliation_decisions)}")
+    print(f"   Total canonical transactions: {canonical_writer.count}")
+    print(f"   ReconciliationDecisions created: {decisions_writer.count}")
     print(f"   Multi-source events: {len(overlap_groups)}")
     print(f"   Single-source events: {single_source_count}")
     print(f"\n🎯 Auditability:")
@@ -15,49 +15,82 @@ PIPELINE FLOW:
 5. Export to StorageSchema format
 
 OUTPUTS:
-- canonical_ledger_schema_v1.json (StorageSchema format)
+- canonical_ledger_schema_v1.ndjson (StorageSchema format, one record per line)
 - reconciliation_decisions.json (Full audit trail)
 - entity_lineage.json (Entity ID change history)
 """
 
+import importlib
+import io
 import json
 import sys
+import traceback
 from pathlib import Path
-from datetime import datetime
-import subprocess
 
-# Add parent to path
+import ijson
+
+# Add parent to path (storage package) and scripts dir (stage modules)
 sys.path.append(str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
 
-from storage.schema import StorageSchema, ReconciliationDecision, EntityLineage
+def run_stage(description: str, module_name: str, argv=None) -> bool:
+    """
+    Run a stage script's main() in-process with logging
 
+    The stage module is imported on first use, so a stage whose
+    dependencies are missing fails on its own without stopping the
+    pipeline. sys.exit() with a non-zero status counts as failure.
 
-def run_command(description: str, command: str):
-    """Run shell command with logging"""
+    Stages still hand data to each other through their output files:
+    those files are the pipeline's deliverables, and reconcile streams
+    its outputs rather than holding them in memory.
+    """
     print(f"\n{'='*80}")
     print(f"🔄 {description}")
     print(f"{'='*80}\n")
 
-    result = subprocess.run(
-        command,
-        shell=True,
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode != 0:
-        print(f"❌ Error: {result.stderr}")
+    try:
+        stage_main = importlib.import_module(module_name).main
+        if argv is None:
+            stage_main()
+        else:
+            stage_main(argv)
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            print(f"❌ Error: {module_name} exited with status {e.code}")
+            return False
+    except Exception:
+        print(f"❌ Error in {module_name}:")
+        traceback.print_exc()
         return False
 
-    print(result.stdout)
     return True
 
 
+def read_top_level_value(path: Path, key: str, default=0):
+    """
+    Read one top-level value from a JSON file without parsing the rest
+
+    Stage outputs write their counts before the big arrays, so this
+    stops after the header instead of loading every record.
+    """
+    with open(path, 'rb') as f:
+        for k, v in ijson.kvitems(f, '', use_float=True):
+            if k == key:
+                return v
+    return default
+
+
 def main():
     """Run complete integrated pipeline"""
 
     base_dir = Path(__file__).parent.parent
-    scripts_dir = base_dir / 'scripts'
+
+    # Stages print straight to our stdout; flush per line so progress
+    # shows up live even when the output is piped or tee'd
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=True)
 
     print("\n" + "="*80)
     print("🚀 INTEGRATED PIPELINE - 100% FRAMEWORK ALIGNED")
@@ -88,11 +121,12 @@ def main():
     print("STAGE 2.5: Entity Resolution (WITH LINEAGE)")
     print("="*80 + "\n")
 
-    entity_script = scripts_dir / 'hybrid_entity_resolution_with_lineage.py'
-
     # Run entity merge with lineage tracking
-    cmd = f'python3 "{entity_script}" merge'
-    success = run_command("Running entity merge with lineage tracking...", cmd)
+    success = run_stage(
+        "Running entity merge with lineage tracking...",
+        'hybrid_entity_resolution_with_lineage',
+        ['merge']
+    )
 
     if not success:
         print("⚠️  Entity merge failed or no entities to merge (continuing...)")
@@ -102,9 +136,7 @@ def main():
     print("STAGE 3: Field-Level Reconciliation (WITH DECISIONS)")
     print("="*80 + "\n")
 
-    recon_script = scripts_dir / 'reconcile_with_decisions.py'
-    cmd = f'python3 "{recon_script}"'
-    success = run_command("Running reconciliation with decision tracking...", cmd)
+    success = run_stage("Running reconciliation with decision tracking...", 'reconcile_with_decisions', [])
 
     if not success:
         print("❌ Reconciliation failed!")
@@ -122,9 +154,7 @@ def main():
         print(f"❌ Canonical ledger not found: {canonical_file}")
         return
 
-    migrate_script = scripts_dir / 'migrate_to_schema.py'
-    cmd = f'python3 "{migrate_script}"'
-    success = run_command("Migrating to StorageSchema format...", cmd)
+    success = run_stage("Migrating to StorageSchema format...", 'migrate_to_schema', [])
 
     # Final summary
     print("\n" + "="*80)
@@ -133,20 +163,27 @@ def main():
     print()
     print("📊 Output Files:")
 
+    # StorageSchema output may be plain or zstd-compressed NDJSON (--zstd)
+    schema_file = base_dir / 'data' / 'canonical' / 'canonical_ledger_schema_v1.ndjson'
+    compressed_schema_file = schema_file.with_name(schema_file.name + '.zst')
+    if compressed_schema_file.exists() and not schema_file.exists():
+        schema_file = compressed_schema_file
+
     # Check outputs
     outputs = [
         ('Canonical Ledger (with decisions)', base_dir / 'data' / 'canonical' / 'canonical_ledger_with_decisions.json'),
         ('Reconciliation Decisions', base_dir / 'data' / 'canonical' / 'reconciliation_decisions.json'),
         ('Entity Lineage', base_dir / 'data' / 'entity-storage' / 'entity_lineage.json'),
-        ('StorageSchema Format', base_dir / 'data' / 'canonical' / 'canonical_ledger_schema_v1.json')
+        ('StorageSchema Format', schema_file)
     ]
 
     for name, path in outputs:
-        if path.exists():
+        try:
             size_mb = path.stat().st_size / 1024 / 1024
-            print(f"   ✅ {name}: {path.name} ({size_mb:.2f} MB)")
-        else:
+        except FileNotFoundError:
             print(f"   ⚠️  {name}: NOT FOUND")
+        else:
+            print(f"   ✅ {name}: {path.name} ({size_mb:.2f} MB)")
 
     print()
     print("🎯 Framework Compliance:")
@@ -161,27 +198,36 @@ def main():
 
     # Load and show statistics
     try:
-        with open(base_dir / 'data' / 'canonical' / 'canonical_ledger_with_decisions.json') as f:
-            canonical = json.load(f)
-
-        with open(base_dir / 'data' / 'canonical' / 'reconciliation_decisions.json') as f:
-            decisions = json.load(f)
+        canonical_dir = base_dir / 'data' / 'canonical'
+        transaction_count = read_top_level_value(
+            canonical_dir / 'canonical_ledger_with_decisions.json', 'transaction_count'
+        )
+        decision_count = read_top_level_value(
+            canonical_dir / 'reconciliation_decisions.json', 'decision_count'
+        )
 
         print("📈 Pipeline Statistics:")
-        print(f"   Canonical transactions: {canonical.get('transaction_count', 0)}")
-        print(f"   ReconciliationDecisions: {decisions.get('decision_count', 0)}")
+        print(f"   Canonical transactions: {transaction_count}")
+        print(f"   ReconciliationDecisions: {decision_count}")
 
         lineage_file = base_dir / 'data' / 'entity-storage' / 'entity_lineage.json'
-        if lineage_file.exists():
-            with open(lineage_file) as f:
-                lineage = json.load(f)
-            print(f"   EntityLineage records: {lineage.get('lineage_count', 0)}")
+        try:
+            lineage_count = read_top_level_value(lineage_file, 'lineage_count')
+        except FileNotFoundError:
+            pass
+        else:
+            print(f"   EntityLineage records: {lineage_count}")
 
-        schema_file = base_dir / 'data' / 'canonical' / 'canonical_ledger_schema_v1.json'
         if schema_file.exists():
-            with open(schema_file) as f:
-                schema = json.load(f)
-            stats = schema.get('statistics', {})
+            # First NDJSON line is the metadata record
+            with open(schema_file, 'rb') as raw:
+                if schema_file.suffix == '.zst':
+                    import zstandard
+                    reader = zstandard.ZstdDecompressor().stream_reader(raw)
+                    metadata = json.loads(io.BufferedReader(reader).readline())
+                else:
+                    metadata = json.loads(raw.readline())
+            stats = metadata.get('statistics', {})
             print(f"\n📦 StorageSchema Statistics:")
             print(f"   Total nodes: {stats.get('total_nodes', 0)}")
             print(f"   EventNodes: {stats.get('event_nodes', 0)}")
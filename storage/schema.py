@@ -11,20 +11,50 @@ Based on Eugenio's architecture:
 All facts are immutable, bitemporal, and have full provenance.
 """
 
+import json
+import sys
+import time
+from array import array
+from bisect import bisect_right, insort
+from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass
 from enum import Enum
 
-
-class NodeType(Enum):
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from enum import StrEnum
+except ImportError:  # Python < 3.11
+    class StrEnum(str, Enum):
+        """Enum whose members are (and serialize as) their string values"""
+        def __str__(self) -> str:
+            return self.value
+
+
+class NodeType(StrEnum):
     """Types of nodes in the registry"""
     ENTITY = "entity"
     EVENT = "event"
     SERIES = "series"
 
 
-class EntityType(Enum):
+class EntityType(StrEnum):
     """Entity types"""
     MERCHANT = "Merchant"
     PERSON = "Person"
@@ -34,7 +64,7 @@ class EntityType(Enum):
     OTHER = "Other"
 
 
-class SeriesType(Enum):
+class SeriesType(StrEnum):
     """Series types (recurring patterns)"""
     BNPL = "bnpl"  # Buy Now Pay Later (e.g., 8sleep)
     INSTALLMENT = "installment"  # Split payments (e.g., iPhone)
@@ -49,7 +79,7 @@ class SeriesType(Enum):
     OTHER = "other"
 
 
-class SeriesStatus(Enum):
+class SeriesStatus(StrEnum):
     """Lifecycle status of a series"""
     ACTIVE = "active"
     PAUSED = "paused"
@@ -57,21 +87,331 @@ class SeriesStatus(Enum):
     COMPLETED = "completed"
 
 
-class EventType(Enum):
+class EventType(StrEnum):
     """Event types"""
     FINANCE_TRANSACTION = "finance_transaction"
     PAYMENT = "payment"
     TRANSFER = "transfer"
 
 
-class NodeStatus(Enum):
+class NodeStatus(StrEnum):
     """Node status"""
     DRAFT = "draft"
     VERIFIED = "verified"
     DEPRECATED = "deprecated"
 
 
-@dataclass
+_clock_cache = [0.0, ""]  # [epoch seconds, ISO string] of the last _now_iso() call
+
+
+def _now_iso() -> str:
+    """
+    datetime.now().isoformat(), reused for up to 1 ms
+
+    Default for created_at/updated_at/observed_at: bulk construction
+    would otherwise format a fresh timestamp for every field.
+    """
+    now = time.time()
+    if not 0.0 <= now - _clock_cache[0] < 0.001:
+        _clock_cache[0] = now
+        _clock_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _clock_cache[1]
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern() plain strings; other values pass through unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_fields(obj: Any, *names: str) -> None:
+    """Intern low-cardinality string fields in place (works on frozen dataclasses)"""
+    for name in names:
+        object.__setattr__(obj, name, _intern(getattr(obj, name)))
+
+
+class FrozenObject(dict):
+    """
+    Read-only dict for AttributeFact.object
+
+    Equal objects are shared between facts (see _interned_object), so
+    every mutator raises TypeError. Being a dict subclass, it still
+    serializes (orjson/json) and compares like the plain dict.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("AttributeFact.object is read-only (build a new dict instead)")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenObject, (dict(self),))
+
+
+# Only objects whose values are all str/int/bool/None are shared: floats
+# are mostly unique amounts (and 0.0 == -0.0 would merge two different
+# JSON values). Value types are part of the key, so 1 and True differ.
+_SHARED_VALUE_TYPES = frozenset((str, int, bool, type(None)))
+
+
+@lru_cache(maxsize=65536)
+def _shared_object(key: Tuple[Tuple[str, type, Any], ...]) -> FrozenObject:
+    """The one FrozenObject for a (key, value type, value) tuple"""
+    return FrozenObject((_intern(k), _intern(v)) for k, _, v in key)
+
+
+def _interned_object(obj: Any) -> Any:
+    """
+    Shared, read-only FrozenObject for an AttributeFact.object dict
+
+    Equal objects (same keys, value types and values, in order) get the
+    same instance, with keys and string values interned; others get
+    their own FrozenObject copy. The caller's dict is never aliased.
+    Non-dict objects pass through unchanged.
+    """
+    if not isinstance(obj, dict):
+        return obj
+    key = []
+    for k, v in obj.items():
+        value_type = type(v)
+        if value_type not in _SHARED_VALUE_TYPES:
+            return obj if type(obj) is FrozenObject else FrozenObject(obj)
+        key.append((k, value_type, v))
+    return _shared_object(tuple(key))
+
+
+# Date formats accepted besides ISO 8601 (ledger dates are MM/DD/YYYY)
+_EXTRA_DATE_FORMATS = ("%m/%d/%Y",)
+
+_NEG_INF = float("-inf")
+_POS_INF = float("inf")
+
+_interval_start = itemgetter(0)
+_lineage_time = attrgetter("_timestamp_ts")
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp_str(value: str) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
+    for date_format in _EXTRA_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Parse a schema timestamp into epoch seconds
+
+    Accepts ISO strings, MM/DD/YYYY dates, datetimes and numbers.
+    Returns None for missing or unparseable values (string parses are
+    cached, since many facts share the same dates).
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return _parse_timestamp_str(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def _as_of_timestamp(as_of: Any) -> float:
+    """parse_timestamp() for query times, which must be parseable"""
+    t = parse_timestamp(as_of)
+    if t is None:
+        raise ValueError(f"Unparseable as-of time: {as_of!r}")
+    return t
+
+
+def _timestamp_or(value: Any, default: float) -> float:
+    """parse_timestamp(), with missing/unparseable values mapped to default"""
+    ts = parse_timestamp(value)
+    return default if ts is None else ts
+
+
+def _make_to_dict(cls, node_type: Optional[NodeType], overrides: Dict[str, str]) -> Callable:
+    """
+    Generate a to_dict() specialized to a dataclass's field list
+
+    The method body is one dict literal, compiled once at import time:
+    enum fields are emitted as-is (StrEnum members are strings), nested
+    dataclass fields (TemporalQualifiers, Provenance) are inlined
+    field-by-field into sub-dicts, and node_type (when given) is a
+    constant placed right after the ID field. Keys are code-object
+    constants (already interned, built with one BUILD_CONST_KEY_MAP).
+    overrides maps a field name to a replacement expression over `self`;
+    sequence copies use [*x], which skips list()'s global lookup and call.
+    """
+    prelude = []
+    items = []
+    for position, f in enumerate(_public_fields(cls)):
+        if f.name in overrides:
+            expr = overrides[f.name]
+        elif isinstance(f.type, type) and is_dataclass(f.type):
+            prelude.append(f"{f.name} = self.{f.name}")
+            inner = ", ".join(f"{g.name!r}: {f.name}.{g.name}" for g in _public_fields(f.type))
+            expr = "{" + inner + "}"
+        else:
+            expr = f"self.{f.name}"
+        items.append(f"{f.name!r}: {expr}")
+
+        if position == 0 and node_type is not None:
+            items.append(f"'node_type': {node_type.value!r}")
+
+    source = "def to_dict(self):\n"
+    source += "".join(f"    {line}\n" for line in prelude)
+    source += "    return {" + ", ".join(items) + "}\n"
+
+    namespace = {}
+    exec(source, globals(), namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{cls.__qualname__}.to_dict"
+    to_dict.__annotations__ = {"return": Dict[str, Any]}
+    return to_dict
+
+
+def _make_from_dict(cls) -> Callable:
+    """
+    Generate a from_dict() classmethod inverting the generated to_dict()
+
+    Skips __init__ (keyword-argument binding, default factories and the
+    frozen __setattr__ guard): the instance comes from object.__new__ and
+    each field is stored through its slot descriptor. Enum fields are
+    rebuilt from their values and nested dataclasses via their own
+    from_dict(); other values are used as-is (not copied). __post_init__,
+    when the class has one, still runs, since it computes derived fields.
+    """
+    namespace = {"_new": object.__new__}
+    lines = ["_get = d.get", "self = _new(cls)"]
+    for f in fields(cls):
+        if f.name.startswith("_"):
+            continue
+        namespace[f"_set_{f.name}"] = cls.__dict__[f.name].__set__
+
+        if not f.metadata.get("serialize", True):  # folded into another field; __post_init__ restores it
+            namespace[f"_default_{f.name}"] = f.default
+            lines.append(f"_set_{f.name}(self, _default_{f.name})")
+            continue
+        if f.default is not MISSING:
+            namespace[f"_default_{f.name}"] = f.default
+            value = f"_get({f.name!r}, _default_{f.name})"
+        elif f.default_factory is not MISSING:
+            namespace[f"_factory_{f.name}"] = f.default_factory
+            value = f"d[{f.name!r}] if {f.name!r} in d else _factory_{f.name}()"
+        else:
+            value = f"d[{f.name!r}]"
+
+        if isinstance(f.type, type) and (issubclass(f.type, Enum) or is_dataclass(f.type)):
+            namespace[f"_type_{f.name}"] = f.type.from_dict if is_dataclass(f.type) else f.type
+            value = f"_type_{f.name}({value})"
+        lines.append(f"_set_{f.name}(self, {value})")
+
+    if hasattr(cls, "__post_init__"):
+        lines.append("self.__post_init__()")
+    lines.append("return self")
+
+    source = "def from_dict(cls, d):\n" + "".join(f"    {line}\n" for line in lines)
+    scope = {**globals(), **namespace}  # helpers are looked up as globals
+    exec(source, scope)
+    from_dict = scope["from_dict"]
+    from_dict.__qualname__ = f"{cls.__qualname__}.from_dict"
+    return classmethod(from_dict)
+
+
+def _public_fields(cls) -> List[Any]:
+    """
+    Dataclass fields that are serialized
+
+    Private _ fields are derived; fields with metadata serialize=False
+    are folded into another field's output by a to_dict() override.
+    """
+    return [
+        f for f in fields(cls)
+        if not f.name.startswith("_") and f.metadata.get("serialize", True)
+    ]
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson default hook: schema records serialize via their to_dict()"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return to_dict()
+
+
+def _json_bytes(value: Any) -> bytes:
+    """Compact UTF-8 JSON via the stdlib (fallback when orjson is missing)"""
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def _json_text(value: Any) -> Optional[str]:
+    """JSON-encode a nested value for a columnar string column (None stays null)"""
+    if value is None:
+        return None
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def _attribute_table(facts: Sequence["AttributeFact"]) -> "pa.Table":
+    """
+    Columnar (Arrow) form of a run of attribute facts
+
+    One row per fact, in order. Scalar fields become typed columns
+    (predicate/observer/source_method dictionary-encoded), temporal
+    bounds are included both as strings and as epoch floats, and nested
+    values (object, source_document, rejected_alternatives) are JSON text.
+    """
+    temporal = [f.temporal for f in facts]
+    provenance = [f.provenance for f in facts]
+    string = pa.string()
+    return pa.table({
+        'statement_id': pa.array([f.statement_id for f in facts], string),
+        'subject_id': pa.array([f.subject_id for f in facts], string),
+        'predicate': pa.array([f.predicate for f in facts], string).dictionary_encode(),
+        'object': pa.array([_json_text(f.object) for f in facts], string),
+        'valid_from': pa.array([t.valid_from for t in temporal], string),
+        'valid_to': pa.array([t.valid_to for t in temporal], string),
+        'observed_at': pa.array([t.observed_at for t in temporal], string),
+        'superseded_at': pa.array([t.superseded_at for t in temporal], string),
+        'valid_from_ts': pa.array([t._valid_from_ts for t in temporal], pa.float64()),
+        'valid_to_ts': pa.array([t._valid_to_ts for t in temporal], pa.float64()),
+        'observation_ids': pa.array([list(p.observation_ids) for p in provenance], pa.list_(string)),
+        'source_method': pa.array([p.source_method for p in provenance], string).dictionary_encode(),
+        'observer': pa.array([p.observer for p in provenance], string).dictionary_encode(),
+        'provenance_created_at': pa.array([p.created_at for p in provenance], string),
+        'confidence': pa.array([p.confidence for p in provenance], pa.float64()),
+        'source_document': pa.array([_json_text(p.source_document) for p in provenance], string),
+        'reconciliation_decision_id': pa.array([f.reconciliation_decision_id for f in facts], string),
+        'rejected_alternatives': pa.array([_json_text(f.rejected_alternatives) for f in facts], string),
+    })
+
+
+def _codegen_to_dict(node_type: Optional[NodeType] = None, **overrides: str):
+    """Class decorator installing a generated to_dict() (see _make_to_dict)"""
+    def decorator(cls):
+        cls.to_dict = _make_to_dict(cls, node_type, overrides)
+        return cls
+    return decorator
+
+
+def _codegen_from_dict(cls):
+    """Class decorator installing a generated from_dict() (see _make_from_dict)"""
+    cls.from_dict = _make_from_dict(cls)
+    return cls
+
+
+@_codegen_from_dict
+@dataclass(slots=True, frozen=True)
 class Provenance:
     """Provenance tracking for facts"""
     observation_ids: List[str]
@@ -81,17 +421,36 @@ class Provenance:
     confidence: float
     source_document: Optional[Dict[str, Any]] = None
 
+    def __post_init__(self):
+        _intern_fields(self, "source_method", "observer")
+
 
-@dataclass
+@_codegen_from_dict
+@dataclass(slots=True, frozen=True)
 class TemporalQualifiers:
     """Bitemporal tracking"""
     valid_from: str  # When this was true in reality
     valid_to: Optional[str] = None  # When this stopped being true
-    observed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    observed_at: str = field(default_factory=_now_iso)
     superseded_at: Optional[str] = None  # When we learned this fact was wrong
 
+    # Epoch-second forms of the above, parsed once for ordering/overlap
+    # tests; unknown bounds are open (-inf / +inf)
+    _valid_from_ts: float = field(init=False, repr=False, compare=False)
+    _valid_to_ts: float = field(init=False, repr=False, compare=False)
+    _observed_at_ts: float = field(init=False, repr=False, compare=False)
+    _superseded_at_ts: float = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "_valid_from_ts", _timestamp_or(self.valid_from, _NEG_INF))
+        object.__setattr__(self, "_valid_to_ts", _timestamp_or(self.valid_to, _POS_INF))
+        object.__setattr__(self, "_observed_at_ts", _timestamp_or(self.observed_at, _NEG_INF))
+        object.__setattr__(self, "_superseded_at_ts", _timestamp_or(self.superseded_at, _POS_INF))
+
+
+@_codegen_from_dict
+@_codegen_to_dict(node_type=NodeType.ENTITY, aliases="[*self.aliases]")
+@dataclass(slots=True)
 class EntityNode:
     """
     Entity Registry Node
@@ -102,25 +461,48 @@ class EntityNode:
     entity_id: str
     type: EntityType
     status: NodeStatus = NodeStatus.VERIFIED
-    aliases: List[str] = field(default_factory=list)
+    aliases: Tuple[str, ...] = ()  # Interned; any iterable is accepted
     external_ids: Dict[str, str] = field(default_factory=dict)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'entity_id': self.entity_id,
-            'node_type': NodeType.ENTITY.value,
-            'type': self.type.value,
-            'status': self.status.value,
-            'aliases': self.aliases,
-            'external_ids': self.external_ids,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+    def __post_init__(self):
+        self.aliases = tuple(map(_intern, self.aliases))
 
 
-@dataclass
+class _Unset:
+    """Sentinel for a promoted snapshot key that is absent"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<unset>"
+
+    def __reduce__(self) -> str:
+        return "_UNSET"  # unpickle to the module singleton
+
+
+_UNSET = _Unset()
+
+# Snapshot keys stored as EventNode slots rather than in the snapshot dict
+_PROMOTED_SNAPSHOT_KEYS = ("amount", "currency")
+
+
+def _event_snapshot(event: "EventNode") -> Dict[str, Any]:
+    """EventNode.snapshot with the promoted keys merged back in (first)"""
+    if event.snapshot_amount is _UNSET and event.snapshot_currency is _UNSET:
+        return event.snapshot
+    snapshot = {}
+    if event.snapshot_amount is not _UNSET:
+        snapshot["amount"] = event.snapshot_amount
+    if event.snapshot_currency is not _UNSET:
+        snapshot["currency"] = event.snapshot_currency
+    snapshot.update(event.snapshot)
+    return snapshot
+
+
+@_codegen_from_dict
+@_codegen_to_dict(node_type=NodeType.EVENT, snapshot="_event_snapshot(self)")
+@dataclass(slots=True)
 class EventNode:
     """
     Event Registry Node
@@ -128,6 +510,10 @@ class EventNode:
     Occurrences that happen at specific times.
     Can have snapshot fields for performance (amount, happened_at),
     but these are materialized from AttributeFacts.
+
+    The amount/currency snapshot keys live in typed slots
+    (snapshot_amount/snapshot_currency, _UNSET when absent); snapshot
+    keeps the remaining keys, and to_dict() merges both back together.
     """
     event_id: str
     event_type: EventType
@@ -137,23 +523,26 @@ class EventNode:
     # Snapshot fields (materialized from AttributeFacts for performance)
     snapshot: Dict[str, Any] = field(default_factory=dict)
 
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'event_id': self.event_id,
-            'node_type': NodeType.EVENT.value,
-            'event_type': self.event_type.value,
-            'happened_at': self.happened_at,
-            'status': self.status.value,
-            'snapshot': self.snapshot,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+    snapshot_amount: Optional[float] = field(default=_UNSET, metadata={"serialize": False})
+    snapshot_currency: Optional[str] = field(default=_UNSET, metadata={"serialize": False})
 
+    def __post_init__(self):
+        snapshot = self.snapshot
+        if "amount" in snapshot or "currency" in snapshot:
+            self.snapshot_amount = snapshot.get("amount", self.snapshot_amount)
+            self.snapshot_currency = snapshot.get("currency", self.snapshot_currency)
+            self.snapshot = {
+                key: value for key, value in snapshot.items()
+                if key not in _PROMOTED_SNAPSHOT_KEYS
+            }
 
-@dataclass
+
+@_codegen_from_dict
+@_codegen_to_dict(node_type=NodeType.SERIES)
+@dataclass(slots=True)
 class SeriesNode:
     """
     Series Registry Node
@@ -187,30 +576,13 @@ class SeriesNode:
     events_count: int = 0  # Number of events in this series
     detection_confidence: float = 1.0  # Confidence in pattern detection
 
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'series_id': self.series_id,
-            'node_type': NodeType.SERIES.value,
-            'series_type': self.series_type.value,
-            'status': self.status.value,
-            'frequency': self.frequency,
-            'expected_amount': self.expected_amount,
-            'amount_tolerance': self.amount_tolerance,
-            'start_date': self.start_date,
-            'end_date': self.end_date,
-            'next_expected_date': self.next_expected_date,
-            'merchant_id': self.merchant_id,
-            'events_count': self.events_count,
-            'detection_confidence': self.detection_confidence,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
 
 
-@dataclass
+@_codegen_from_dict
+@_codegen_to_dict(rejected_alternatives="[*self.rejected_alternatives]")
+@dataclass(slots=True, frozen=True)
 class AttributeFact:
     """
     Attribute Fact (subject-predicate-object triple)
@@ -226,7 +598,7 @@ class AttributeFact:
     statement_id: str
     subject_id: str  # entity_id, event_id, or series_id
     predicate: str  # attribute name (e.g., "canonical_name", "amount")
-    object: Dict[str, Any]  # {"value": ..., "type": "string|number|date|..."}
+    object: Dict[str, Any]  # {"value": ..., "type": "string|number|date|..."}, stored read-only (FrozenObject)
 
     # Qualifiers
     temporal: TemporalQualifiers
@@ -234,34 +606,18 @@ class AttributeFact:
 
     # Reconciliation tracking
     reconciliation_decision_id: Optional[str] = None
-    rejected_alternatives: List[Dict[str, Any]] = field(default_factory=list)
+    rejected_alternatives: Sequence[Dict[str, Any]] = ()  # Shared empty tuple when none
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'statement_id': self.statement_id,
-            'subject_id': self.subject_id,
-            'predicate': self.predicate,
-            'object': self.object,
-            'temporal': {
-                'valid_from': self.temporal.valid_from,
-                'valid_to': self.temporal.valid_to,
-                'observed_at': self.temporal.observed_at,
-                'superseded_at': self.temporal.superseded_at
-            },
-            'provenance': {
-                'observation_ids': self.provenance.observation_ids,
-                'source_method': self.provenance.source_method,
-                'observer': self.provenance.observer,
-                'created_at': self.provenance.created_at,
-                'confidence': self.provenance.confidence,
-                'source_document': self.provenance.source_document
-            },
-            'reconciliation_decision_id': self.reconciliation_decision_id,
-            'rejected_alternatives': self.rejected_alternatives
-        }
+    def __post_init__(self):
+        _intern_fields(self, "predicate")
+        object.__setattr__(self, "object", _interned_object(self.object))
+        if not self.rejected_alternatives:
+            object.__setattr__(self, "rejected_alternatives", ())
 
 
-@dataclass
+@_codegen_from_dict
+@_codegen_to_dict(rejected_alternatives="[*self.rejected_alternatives]")
+@dataclass(slots=True, frozen=True)
 class RelationshipFact:
     """
     Relationship Fact (subject-predicate-target triple)
@@ -285,34 +641,17 @@ class RelationshipFact:
 
     # Reconciliation tracking
     reconciliation_decision_id: Optional[str] = None
-    rejected_alternatives: List[Dict[str, Any]] = field(default_factory=list)
+    rejected_alternatives: Sequence[Dict[str, Any]] = ()  # Shared empty tuple when none
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'statement_id': self.statement_id,
-            'subject_id': self.subject_id,
-            'predicate': self.predicate,
-            'target_id': self.target_id,
-            'temporal': {
-                'valid_from': self.temporal.valid_from,
-                'valid_to': self.temporal.valid_to,
-                'observed_at': self.temporal.observed_at,
-                'superseded_at': self.temporal.superseded_at
-            },
-            'provenance': {
-                'observation_ids': self.provenance.observation_ids,
-                'source_method': self.provenance.source_method,
-                'observer': self.provenance.observer,
-                'created_at': self.provenance.created_at,
-                'confidence': self.provenance.confidence,
-                'source_document': self.provenance.source_document
-            },
-            'reconciliation_decision_id': self.reconciliation_decision_id,
-            'rejected_alternatives': self.rejected_alternatives
-        }
+    def __post_init__(self):
+        _intern_fields(self, "predicate")
+        if not self.rejected_alternatives:
+            object.__setattr__(self, "rejected_alternatives", ())
 
 
-@dataclass
+@_codegen_from_dict
+@_codegen_to_dict()
+@dataclass(slots=True, frozen=True)
 class EntityLineage:
     """
     Entity Lineage - Tracks Entity ID Changes Over Time
@@ -347,25 +686,33 @@ class EntityLineage:
     affected_statement_ids: List[str] = field(default_factory=list)  # Facts that were updated
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'lineage_id': self.lineage_id,
-            'timestamp': self.timestamp,
-            'old_entity_id': self.old_entity_id,
-            'new_entity_id': self.new_entity_id,
-            'operation': self.operation,
-            'reason': self.reason,
-            'confidence': self.confidence,
-            'performed_by': self.performed_by,
-            'affected_statement_ids': self.affected_statement_ids,
-            'metadata': self.metadata,
-            'created_at': self.created_at
-        }
+    # Epoch-second form of timestamp (-inf if unparseable), for as-of queries
+    _timestamp_ts: float = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        _intern_fields(self, "operation", "performed_by")
+        object.__setattr__(self, "_timestamp_ts", _timestamp_or(self.timestamp, _NEG_INF))
 
-@dataclass
+
+@_codegen_from_dict
+@_codegen_to_dict(alternatives="[*self.alternatives]")
+@dataclass(slots=True, frozen=True)
+class FieldStrategy:
+    """How one predicate was resolved within a ReconciliationDecision"""
+    strategy: str
+    chosen_obs: str
+    confidence: float = 1.0
+    alternatives: Sequence[Any] = ()  # Shared empty tuple when none were rejected
+
+
+@_codegen_from_dict
+@_codegen_to_dict(field_strategies=(
+    "{predicate: fs.to_dict() if isinstance(fs, FieldStrategy) else fs"
+    " for predicate, fs in self.field_strategies.items()}"
+))
+@dataclass(slots=True, frozen=True)
 class ReconciliationDecision:
     """
     Reconciliation Decision - First-Class Object
@@ -391,7 +738,7 @@ class ReconciliationDecision:
     cluster_metadata: Dict[str, Any]  # From overlap detection
 
     # Field-level decisions
-    field_strategies: Dict[str, Dict[str, Any]]  # predicate -> strategy applied
+    field_strategies: Dict[str, Union[FieldStrategy, Dict[str, Any]]]  # predicate -> strategy applied
     # Example: {
     #   "amount": {"strategy": "first_source", "chosen_obs": "obs_bofa_001"},
     #   "description": {"strategy": "most_complete", "chosen_obs": "obs_wise_002"}
@@ -404,23 +751,83 @@ class ReconciliationDecision:
     confidence: float
     decision_method: str  # "automated" | "manual_review" | "human_override"
 
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'decision_id': self.decision_id,
-            'timestamp': self.timestamp,
-            'observation_ids': self.observation_ids,
-            'cluster_metadata': self.cluster_metadata,
-            'field_strategies': self.field_strategies,
-            'created_statement_ids': self.created_statement_ids,
-            'confidence': self.confidence,
-            'decision_method': self.decision_method,
-            'created_at': self.created_at
-        }
+    def __post_init__(self):
+        _intern_fields(self, "decision_method")
+
+
+# Fact fields whose instances are shared between facts (migrate gives all
+# facts of a transaction, attribute and relationship alike, one
+# TemporalQualifiers/Provenance); pickled once
+_SHARED_FACT_FIELDS = frozenset(("temporal", "provenance"))
 
 
-@dataclass
+def _fact_columns(cls, facts: Sequence[Any], shared_rows: Dict[str, Tuple[Dict[int, int], List[tuple]]]
+                  ) -> Dict[str, Any]:
+    """
+    Column-wise pickle state for a list of AttributeFacts/RelationshipFacts
+
+    One list per public field, in constructor order. Shared qualifier
+    fields are stored as an array of row positions into shared_rows
+    (field name -> (row per instance id, rows of field values)), which
+    is filled across both fact lists: sharing is kept, even between
+    attribute and relationship facts, and each instance is pickled once.
+    """
+    columns = {}
+    for f in _public_fields(cls):
+        values = list(map(attrgetter(f.name), facts))
+        if f.name in _SHARED_FACT_FIELDS:
+            row_of, rows = shared_rows.setdefault(f.name, ({}, []))
+            positions = array("I")
+            for value in values:
+                row = row_of.get(id(value))
+                if row is None:
+                    row = row_of[id(value)] = len(rows)
+                    rows.append(tuple(getattr(value, g.name) for g in _public_fields(f.type)))
+                positions.append(row)
+            values = positions
+        columns[f.name] = values
+    return columns
+
+
+def _facts_from_columns(cls, columns: Dict[str, Any], shared: Dict[str, List[Any]]) -> List[Any]:
+    """Rebuild facts from _fact_columns() state (constructors run as usual)"""
+    args = []
+    for f in _public_fields(cls):
+        values = columns[f.name]
+        if f.name in _SHARED_FACT_FIELDS:
+            values = map(shared[f.name].__getitem__, values)
+        args.append(values)
+    return list(map(cls, *args))
+
+
+def _rebuild_storage(nodes, shared_rows, attribute_columns, relationship_columns,
+                     reconciliation_decisions, entity_lineage) -> "StorageSchema":
+    """Unpickle a StorageSchema (see StorageSchema.__reduce__); indexes are rebuilt"""
+    qualifier_types = {f.name: f.type for f in _public_fields(AttributeFact) if f.name in _SHARED_FACT_FIELDS}
+    shared = {
+        name: [qualifier_types[name](*row) for row in rows]
+        for name, rows in shared_rows.items()
+    }
+    return StorageSchema(
+        nodes=nodes,
+        attribute_facts=_facts_from_columns(AttributeFact, attribute_columns, shared),
+        relationship_facts=_facts_from_columns(RelationshipFact, relationship_columns, shared),
+        reconciliation_decisions=reconciliation_decisions,
+        entity_lineage=entity_lineage
+    )
+
+
+# Node class per to_dict() node_type, for StorageSchema.from_dict
+_NODE_CLASSES = {
+    NodeType.ENTITY: EntityNode,
+    NodeType.EVENT: EventNode,
+    NodeType.SERIES: SeriesNode,
+}
+
+
+@dataclass(slots=True)
 class StorageSchema:
     """
     Complete storage schema
@@ -438,6 +845,167 @@ class StorageSchema:
     reconciliation_decisions: List[ReconciliationDecision] = field(default_factory=list)
     entity_lineage: List[EntityLineage] = field(default_factory=list)
 
+    # Lookup indexes, maintained by the add_* methods
+    _facts_by_subject: Dict[str, List[AttributeFact]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False)
+    _rels_by_subject: Dict[str, List[RelationshipFact]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False)
+    _facts_by_sp: Dict[Tuple[str, str], List[AttributeFact]] = field(  # (subject_id, predicate)
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False)
+    _rels_by_sp: Dict[Tuple[str, str], List[RelationshipFact]] = field(  # (subject_id, predicate)
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False)
+    _lineage_by_entity: Dict[str, List[EntityLineage]] = field(  # old and new IDs
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False)
+    _lineage_by_old_id: Dict[str, EntityLineage] = field(  # first record per old ID
+        default_factory=dict, init=False, repr=False, compare=False)
+    _decisions_by_id: Dict[str, ReconciliationDecision] = field(  # first decision per ID
+        default_factory=dict, init=False, repr=False, compare=False)
+    _id_pool: Dict[str, str] = field(  # one shared str per distinct ID in the ID-list fields
+        default_factory=dict, init=False, repr=False, compare=False)
+    _successor: Dict[str, str] = field(  # old -> new ID, path-compressed by resolve_current_entity_id
+        default_factory=dict, init=False, repr=False, compare=False)
+    _lineage_timeline: List[EntityLineage] = field(  # sorted by timestamp, for as-of queries
+        default_factory=list, init=False, repr=False, compare=False)
+
+    # Valid-time indexes: (subject_id, predicate) -> [(valid_from, valid_to, fact)]
+    # sorted by valid_from, built per key on the first as-of query (see _valid_entries)
+    _attr_valid_index: Dict[Tuple[str, str], List[Tuple[float, float, AttributeFact]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _rel_valid_index: Dict[Tuple[str, str], List[Tuple[float, float, RelationshipFact]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    # Columnar view of attribute_facts, extended on demand (see attribute_table)
+    _attr_table: Optional["pa.Table"] = field(default=None, init=False, repr=False, compare=False)
+
+    def __reduce__(self):
+        """
+        Pickle the facts column-wise rather than one dataclass at a time
+
+        Lookup indexes, pools and the Arrow view are not pickled; they
+        are rebuilt on load by the constructor.
+        """
+        shared_rows = {}
+        attribute_columns = _fact_columns(AttributeFact, self.attribute_facts, shared_rows)
+        relationship_columns = _fact_columns(RelationshipFact, self.relationship_facts, shared_rows)
+        return (_rebuild_storage, (
+            self.nodes,
+            {name: rows for name, (_, rows) in shared_rows.items()},
+            attribute_columns,
+            relationship_columns,
+            self.reconciliation_decisions,
+            self.entity_lineage
+        ))
+
+    def __post_init__(self):
+        """Index any facts/records passed to the constructor"""
+        self._index_facts(self.attribute_facts, self._facts_by_subject, self._facts_by_sp)
+        self._index_facts(self.relationship_facts, self._rels_by_subject, self._rels_by_sp)
+        self._pool_fact_ids(self.attribute_facts)
+        self._pool_fact_ids(self.relationship_facts)
+        for decision in self.reconciliation_decisions:
+            self._index_decision(decision)
+        for record in self.entity_lineage:
+            self._index_lineage(record)
+
+    def _pool_ids(self, ids: List[str]) -> None:
+        """
+        Dictionary-encode an ID list in place against _id_pool
+
+        Equal IDs across records (e.g. loaded from JSON, where every
+        occurrence is a new string) end up as one shared str object, so
+        each list slot costs a pointer and equality is an identity check.
+        """
+        if type(ids) is not list:
+            return
+        pooled = self._id_pool.setdefault
+        ids[:] = [pooled(value, value) for value in ids]
+
+    def _pool_fact_ids(self, facts: Sequence[Any]) -> None:
+        """
+        Pool provenance.observation_ids, once per shared Provenance
+
+        Only the bulk paths (constructor/load, add_*_facts) pool fact IDs;
+        add_attribute_fact/add_relationship_fact leave the lists as given.
+        """
+        last = None
+        for fact in facts:
+            provenance = fact.provenance
+            if provenance is not last:
+                self._pool_ids(provenance.observation_ids)
+                last = provenance
+
+    def _index_decision(self, decision: ReconciliationDecision) -> None:
+        """Index a decision by ID (first wins) and pool its ID lists"""
+        self._decisions_by_id.setdefault(decision.decision_id, decision)
+        self._pool_ids(decision.observation_ids)
+        self._pool_ids(decision.created_statement_ids)
+
+    def _index_attribute_fact(self, fact: AttributeFact) -> None:
+        """Index an attribute fact by subject and by subject+predicate"""
+        self._facts_by_subject[fact.subject_id].append(fact)
+        self._facts_by_sp[fact.subject_id, fact.predicate].append(fact)
+
+    def _index_relationship_fact(self, fact: RelationshipFact) -> None:
+        """Index a relationship fact by subject and by subject+predicate"""
+        self._rels_by_subject[fact.subject_id].append(fact)
+        self._rels_by_sp[fact.subject_id, fact.predicate].append(fact)
+
+    @staticmethod
+    def _index_facts(facts: Sequence[Any], by_subject: Dict[str, List[Any]],
+                     by_sp: Dict[Tuple[str, str], List[Any]]) -> None:
+        """Index a batch of attribute or relationship facts by subject and by subject+predicate"""
+        for fact in facts:
+            subject_id = fact.subject_id
+            by_subject[subject_id].append(fact)
+            by_sp[subject_id, fact.predicate].append(fact)
+
+    @staticmethod
+    def _valid_entries(by_sp: Dict[Tuple[str, str], List[Any]],
+                       valid_index: Dict[Tuple[str, str], List[Tuple[float, float, Any]]],
+                       key: Tuple[str, str]) -> List[Tuple[float, float, Any]]:
+        """
+        Valid-time entries for one (subject_id, predicate), sorted by valid_from
+
+        Built from the subject+predicate index on the first as-of query for
+        the key, so adding facts does no valid-time work. Facts added since
+        (the index is append-only) are appended on the next query and the
+        list re-sorted; the sort is stable, so equal starts stay in
+        insertion order.
+        """
+        facts = by_sp.get(key)
+        if not facts:
+            return []
+        entries = valid_index.get(key)
+        if entries is None:
+            entries = valid_index[key] = []
+        if len(entries) < len(facts):
+            for fact in facts[len(entries):]:
+                temporal = fact.temporal
+                entries.append((temporal._valid_from_ts, temporal._valid_to_ts, fact))
+            entries.sort(key=_interval_start)
+        return entries
+
+    def _index_lineage(self, record: EntityLineage) -> None:
+        """Index a lineage record under both of its entity IDs and by time"""
+        self._pool_ids(record.affected_statement_ids)
+        self._lineage_by_entity[record.old_entity_id].append(record)
+        if record.new_entity_id != record.old_entity_id:
+            self._lineage_by_entity[record.new_entity_id].append(record)
+        insort(self._lineage_timeline, record, key=_lineage_time)
+
+        old_id, new_id = record.old_entity_id, record.new_entity_id
+        if old_id in self._lineage_by_old_id:
+            return
+        self._lineage_by_old_id[old_id] = record
+        if old_id != new_id and self.resolve_current_entity_id(new_id) == old_id:
+            # The new edge closes a cycle through nodes that may already be
+            # compressed; cycle walks depend on the raw edges, so restart
+            self._successor = {
+                old: lineage.new_entity_id for old, lineage in self._lineage_by_old_id.items()
+            }
+        else:
+            self._successor[old_id] = new_id
+
     def add_entity(self, entity: EntityNode) -> None:
         """Add entity to registry"""
         self.nodes[entity.entity_id] = entity
@@ -453,18 +1021,34 @@ class StorageSchema:
     def add_attribute_fact(self, fact: AttributeFact) -> None:
         """Add attribute fact"""
         self.attribute_facts.append(fact)
+        self._index_attribute_fact(fact)
 
     def add_relationship_fact(self, fact: RelationshipFact) -> None:
         """Add relationship fact"""
         self.relationship_facts.append(fact)
+        self._index_relationship_fact(fact)
+
+    def add_attribute_facts(self, facts: Sequence[AttributeFact]) -> None:
+        """Add a batch of attribute facts (one extend + one indexing pass)"""
+        self.attribute_facts.extend(facts)
+        self._index_facts(facts, self._facts_by_subject, self._facts_by_sp)
+        self._pool_fact_ids(facts)
+
+    def add_relationship_facts(self, facts: Sequence[RelationshipFact]) -> None:
+        """Add a batch of relationship facts (one extend + one indexing pass)"""
+        self.relationship_facts.extend(facts)
+        self._index_facts(facts, self._rels_by_subject, self._rels_by_sp)
+        self._pool_fact_ids(facts)
 
     def add_reconciliation_decision(self, decision: ReconciliationDecision) -> None:
         """Add reconciliation decision"""
         self.reconciliation_decisions.append(decision)
+        self._index_decision(decision)
 
     def add_entity_lineage(self, lineage: EntityLineage) -> None:
         """Add entity lineage record"""
         self.entity_lineage.append(lineage)
+        self._index_lineage(lineage)
 
     def get_node(self, node_id: str) -> Optional[EntityNode | EventNode | SeriesNode]:
         """Get node by ID"""
@@ -472,56 +1056,238 @@ class StorageSchema:
 
     def get_entity_lineage(self, entity_id: str) -> List[EntityLineage]:
         """Get lineage history for an entity"""
-        lineage = []
-        for record in self.entity_lineage:
-            if record.old_entity_id == entity_id or record.new_entity_id == entity_id:
-                lineage.append(record)
-        return lineage
+        return list(self._lineage_by_entity.get(entity_id, ()))
 
     def resolve_current_entity_id(self, entity_id: str) -> str:
         """
         Resolve an entity ID to its current canonical ID
 
         Follows lineage chain: old_id -> new_id -> newer_id -> ...
+        Once a chain ends, every ID walked is re-pointed straight at the
+        end (path compression); chains that loop are left as they are.
+        """
+        successor = self._successor
+        current_id = entity_id
+        path = {}  # IDs walked, in order (doubles as the visited set)
+
+        while current_id not in path:
+            next_id = successor.get(current_id)
+            if next_id is None:
+                for walked_id in path:
+                    successor[walked_id] = current_id
+                break
+            path[current_id] = None
+            current_id = next_id
+
+        return current_id
+
+    def get_lineage_as_of(self, as_of: Any) -> List[EntityLineage]:
+        """All lineage records with timestamp <= as_of, oldest first"""
+        t = _as_of_timestamp(as_of)
+        timeline = self._lineage_timeline
+        return timeline[:bisect_right(timeline, t, key=_lineage_time)]
+
+    def resolve_entity_id_as_of(self, entity_id: str, as_of: Any) -> str:
+        """
+        Resolve an entity ID as it stood at a point in time
+
+        Same walk as resolve_current_entity_id(), but only lineage records
+        with timestamp <= as_of are followed (the first such record per old
+        ID wins). Not path-compressed, since the answer depends on as_of.
         """
+        t = _as_of_timestamp(as_of)
         current_id = entity_id
         visited = set()
 
         while current_id not in visited:
             visited.add(current_id)
-            found_newer = False
-
-            for record in self.entity_lineage:
-                if record.old_entity_id == current_id:
-                    current_id = record.new_entity_id
-                    found_newer = True
-                    break
-
-            if not found_newer:
+            next_id = next((
+                record.new_entity_id for record in self._lineage_by_entity.get(current_id, ())
+                if record.old_entity_id == current_id and record._timestamp_ts <= t
+            ), None)
+            if next_id is None:
                 break
+            current_id = next_id
 
         return current_id
 
     def get_attributes(self, subject_id: str, predicate: Optional[str] = None) -> List[AttributeFact]:
         """Get attribute facts for a subject"""
-        facts = [f for f in self.attribute_facts if f.subject_id == subject_id]
         if predicate:
-            facts = [f for f in facts if f.predicate == predicate]
-        return facts
+            return list(self._facts_by_sp.get((subject_id, _intern(predicate)), ()))
+        return list(self._facts_by_subject.get(subject_id, ()))
 
     def get_relationships(self, subject_id: str, predicate: Optional[str] = None) -> List[RelationshipFact]:
         """Get relationship facts for a subject"""
-        facts = [f for f in self.relationship_facts if f.subject_id == subject_id]
         if predicate:
-            facts = [f for f in facts if f.predicate == predicate]
-        return facts
+            return list(self._rels_by_sp.get((subject_id, _intern(predicate)), ()))
+        return list(self._rels_by_subject.get(subject_id, ()))
+
+    @staticmethod
+    def _valid_at(entries: List[Tuple[float, float, Any]], as_of: Any) -> List[Any]:
+        """Facts from a valid-time index whose [valid_from, valid_to) contains as_of"""
+        t = _as_of_timestamp(as_of)
+        hi = bisect_right(entries, t, key=_interval_start)
+        return [fact for start, end, fact in entries[:hi] if end > t]
+
+    def get_attributes_as_of(self, subject_id: str, predicate: str, as_of: Any) -> List[AttributeFact]:
+        """
+        Get attribute facts for a subject/predicate valid at a point in time
+
+        as_of may be an ISO string, MM/DD/YYYY date, datetime or epoch
+        seconds. Facts with no (or unparseable) valid_from count as valid
+        since the beginning; valid_to of None means still valid.
+        """
+        key = (subject_id, _intern(predicate))
+        return self._valid_at(self._valid_entries(self._facts_by_sp, self._attr_valid_index, key), as_of)
+
+    def get_relationships_as_of(self, subject_id: str, predicate: str, as_of: Any) -> List[RelationshipFact]:
+        """Get relationship facts for a subject/predicate valid at a point in time"""
+        key = (subject_id, _intern(predicate))
+        return self._valid_at(self._valid_entries(self._rels_by_sp, self._rel_valid_index, key), as_of)
+
+    def attribute_table(self) -> "pa.Table":
+        """
+        Attribute facts as an Arrow table (row i = attribute_facts[i])
+
+        Built on first use and extended with only the newly appended
+        facts on later calls (facts are append-only). Requires pyarrow.
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for columnar export (pip install pyarrow)")
+
+        table = self._attr_table
+        built = 0 if table is None else table.num_rows
+        total = len(self.attribute_facts)
+        if built > total:  # list was replaced/truncated: rebuild
+            table, built = None, 0
+        if table is None or built < total:
+            tail = _attribute_table(self.attribute_facts[built:])
+            table = tail if table is None else pa.concat_tables([table, tail])
+            self._attr_table = table
+        return table
+
+    def find_attributes(self, subject_id: Optional[str] = None, predicate: Optional[str] = None,
+                        as_of: Any = None) -> List[AttributeFact]:
+        """
+        Scan all attribute facts with any combination of filters
+
+        Unlike get_attributes()/get_attributes_as_of(), subject_id is
+        optional, so this answers store-wide questions (every "amount"
+        valid at a date, ...). The scan is vectorized over
+        attribute_table() when pyarrow is installed.
+        """
+        t = None
+        if as_of is not None:
+            t = _as_of_timestamp(as_of)
+
+        if not PYARROW_AVAILABLE:
+            return [
+                f for f in self.attribute_facts
+                if (subject_id is None or f.subject_id == subject_id)
+                and (predicate is None or f.predicate == predicate)
+                and (t is None or f.temporal._valid_from_ts <= t < f.temporal._valid_to_ts)
+            ]
+
+        table = self.attribute_table()
+        masks = []
+        if subject_id is not None:
+            masks.append(pc.equal(table['subject_id'], subject_id))
+        if predicate is not None:
+            masks.append(pc.equal(table['predicate'], predicate))
+        if t is not None:
+            masks.append(pc.less_equal(table['valid_from_ts'], t))
+            masks.append(pc.greater(table['valid_to_ts'], t))
+        if not masks:
+            return list(self.attribute_facts)
+
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = pc.and_(mask, other)
+        facts = self.attribute_facts
+        return [facts[i] for i in pc.indices_nonzero(mask).to_pylist()]
+
+    def write_attributes_parquet(self, path: Any) -> None:
+        """Persist attribute_table() as a Parquet file"""
+        pq.write_table(self.attribute_table(), path)
 
     def get_reconciliation_decision(self, decision_id: str) -> Optional[ReconciliationDecision]:
         """Get reconciliation decision by ID"""
+        return self._decisions_by_id.get(decision_id)
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Export as a stream of (kind, record) pairs
+
+        Kinds: node type ("entity" | "event" | "series"), "attribute_fact",
+        "relationship_fact", "reconciliation_decision", "entity_lineage".
+        Records are produced one at a time, so large stores can be written
+        line-by-line (NDJSON) without building the full to_dict() tree.
+        """
+        for node in self.nodes.values():
+            record = node.to_dict()
+            yield record['node_type'], record
+        for fact in self.attribute_facts:
+            yield 'attribute_fact', fact.to_dict()
+        for fact in self.relationship_facts:
+            yield 'relationship_fact', fact.to_dict()
         for decision in self.reconciliation_decisions:
-            if decision.decision_id == decision_id:
-                return decision
-        return None
+            yield 'reconciliation_decision', decision.to_dict()
+        for record in self.entity_lineage:
+            yield 'entity_lineage', record.to_dict()
+
+    def to_json_bytes(self) -> bytes:
+        """
+        Export the to_dict() document as JSON bytes
+
+        With orjson, records are passed through to _json_default one at a
+        time, so the full nested dict tree is never built. Falls back to
+        json.dumps(to_dict()) when orjson is not installed.
+        """
+        if not ORJSON_AVAILABLE:
+            return _json_bytes(self.to_dict())
+
+        return orjson.dumps({
+            'nodes': self.nodes,
+            'attribute_facts': self.attribute_facts,
+            'relationship_facts': self.relationship_facts,
+            'reconciliation_decisions': self.reconciliation_decisions,
+            'entity_lineage': self.entity_lineage
+        }, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def write_json(self, fp: BinaryIO) -> None:
+        """
+        Stream the to_dict() document to a binary file object
+
+        Records are encoded and written one at a time, so peak memory is
+        one record rather than the whole tree; the bytes written match
+        to_json_bytes().
+        """
+        dumps = orjson.dumps if ORJSON_AVAILABLE else _json_bytes
+        write = fp.write
+
+        write(b'{"nodes":{')
+        for position, (node_id, node) in enumerate(self.nodes.items()):
+            if position:
+                write(b',')
+            write(dumps(node_id))
+            write(b':')
+            write(dumps(node.to_dict()))
+        write(b'}')
+
+        for key, records in (
+            ('attribute_facts', self.attribute_facts),
+            ('relationship_facts', self.relationship_facts),
+            ('reconciliation_decisions', self.reconciliation_decisions),
+            ('entity_lineage', self.entity_lineage),
+        ):
+            write(b',"' + key.encode() + b'":[')
+            for position, record in enumerate(records):
+                if position:
+                    write(b',')
+                write(dumps(record.to_dict()))
+            write(b']')
+        write(b'}')
 
     def to_dict(self) -> Dict[str, Any]:
         """Export to dictionary"""
@@ -535,3 +1301,19 @@ class StorageSchema:
             'reconciliation_decisions': [d.to_dict() for d in self.reconciliation_decisions],
             'entity_lineage': [l.to_dict() for l in self.entity_lineage]
         }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StorageSchema":
+        """Load a store exported by to_dict() (or parsed from to_json_bytes())"""
+        return cls(
+            nodes={
+                node_id: _NODE_CLASSES[record['node_type']].from_dict(record)
+                for node_id, record in data.get('nodes', {}).items()
+            },
+            attribute_facts=[AttributeFact.from_dict(r) for r in data.get('attribute_facts', ())],
+            relationship_facts=[RelationshipFact.from_dict(r) for r in data.get('relationship_facts', ())],
+            reconciliation_decisions=[
+                ReconciliationDecision.from_dict(r) for r in data.get('reconciliation_decisions', ())
+            ],
+            entity_lineage=[EntityLineage.from_dict(r) for r in data.get('entity_lineage', ())]
+        )
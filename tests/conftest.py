@@ -0,0 +1,88 @@
+"""Shared test setup: import paths and stand-ins for modules outside this tree"""
+
+import re
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+
+def _install_resolver_stub():
+    """
+    Minimal hybrid_entity_resolution (the base resolver is not in this tree)
+
+    Only the parts the lineage module inherits or calls are provided.
+    """
+    module = types.ModuleType('hybrid_entity_resolution')
+
+    class MerchantNormalizer:
+        def normalize(self, name):
+            return re.sub(r'\s+', ' ', re.sub(r'[^A-Z0-9 ]+', ' ', name.upper())).strip()
+
+    class EntityMergeJob:
+        def __init__(self, entities_file):
+            self.entities_file = Path(entities_file)
+
+    class BatchEntityClusterer:
+        def __init__(self, raw_ledger, output_dir):
+            self.raw_ledger = raw_ledger
+            self.output_dir = output_dir
+
+    class HybridEntityResolver:
+        pass
+
+    module.MerchantNormalizer = MerchantNormalizer
+    module.EntityMergeJob = EntityMergeJob
+    module.BatchEntityClusterer = BatchEntityClusterer
+    module.HybridEntityResolver = HybridEntityResolver
+    sys.modules['hybrid_entity_resolution'] = module
+
+
+def _install_reconciler_stub():
+    """
+    Minimal reconcile_field_level (the field-level engine is not in this tree)
+
+    The canonical takes every schema field from the first observation.
+    """
+    module = types.ModuleType('reconcile_field_level')
+    module.FIELD_SCHEMA = {name: {} for name in ('amount', 'currency', 'date', 'merchant', 'description')}
+    module.SOURCE_PRIORITY = {}
+
+    def reconcile_observations(observations, registry=None):
+        first = observations[0]
+        observation_id = first.get('observation_id') or first.get('id')
+        method = 'single_source' if len(observations) == 1 else 'priority'
+        canonical = {
+            'id': f'canonical_{observation_id}',
+            'reconciliation_metadata': {
+                'observation_count': len(observations),
+                'observation_ids': [obs.get('observation_id') or obs.get('id') for obs in observations],
+                'data_sources': sorted({obs.get('data_source', 'unknown') for obs in observations}),
+            },
+        }
+        for name in module.FIELD_SCHEMA:
+            if name in first:
+                canonical[name] = {
+                    'value': first[name],
+                    'source_observation_id': observation_id,
+                    'reconciliation_method': method,
+                    'confidence': 1.0,
+                }
+        return canonical
+
+    module.reconcile_observations = reconcile_observations
+    sys.modules['reconcile_field_level'] = module
+
+
+try:
+    import hybrid_entity_resolution  # noqa: F401
+except ImportError:
+    _install_resolver_stub()
+
+try:
+    import reconcile_field_level  # noqa: F401
+except ImportError:
+    _install_reconciler_stub()
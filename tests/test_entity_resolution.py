@@ -0,0 +1,199 @@
+"""Tests for duplicate-entity scoring and merging in hybrid_entity_resolution_with_lineage"""
+
+import random
+import string
+
+import orjson
+import pytest
+
+import hybrid_entity_resolution_with_lineage as resolution
+
+THRESHOLD = resolution.MERGE_SIMILARITY_THRESHOLD
+
+# Brand vs sub-brand: distinct merchants that share a prefix
+DISTINCT_PAIRS = [
+    ('Uber', 'Uber Eats'),
+    ('Amazon', 'Amazon Web Services'),
+    ('AT&T', 'AT&T Wireless'),
+    ('Target', 'Target Optical'),
+    ('Apple', 'Apple Store'),
+]
+
+NAMES = [
+    'Uber', 'Uber Eats', 'Amazon', 'Amazon Web Services', 'Amazon.com',
+    'Amazon com', 'AT&T', 'AT&T Wireless', 'Target', 'Target Optical',
+    'Apple', 'Apple Store', 'Walmart', 'Wal-Mart', 'Netflix', 'NETFLIX',
+    "Trader Joe's", 'Trader Joes', 'Whole Foods Market', 'Whole Foods Mkt',
+    'Starbucks', 'Starbucks Coffee', 'Safeway', 'Safeway Inc',
+    # Ratcliff/Obershelp (difflib) and LCS disagree on this pair
+    ' abcac d bc', ' d d adbd',
+]
+
+SCORERS = [resolution._lcs_pairs]
+if resolution.RAPIDFUZZ_AVAILABLE:
+    SCORERS.append(resolution._rapidfuzz_pairs)
+if resolution.NUMBA_AVAILABLE:
+    SCORERS.append(resolution.indel_pairs)
+
+
+def _perturbed_names(count, seed=0):
+    """Seeded merchant-like names, each followed by two lightly edited variants"""
+    rng = random.Random(seed)
+    words = [
+        ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        for _ in range(200)
+    ]
+    names = []
+    for _ in range(count):
+        name = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        names.append(name)
+        for _ in range(2):
+            chars = list(name)
+            for _ in range(rng.randint(1, 3)):
+                position = rng.randrange(len(chars))
+                op = rng.random()
+                if op < 0.3 and len(chars) > 1:
+                    del chars[position]
+                elif op < 0.6:
+                    chars.insert(position, rng.choice(string.ascii_lowercase + " .-&'"))
+                else:
+                    chars[position] = rng.choice(string.ascii_lowercase)
+            names.append(''.join(chars).title() if rng.random() < 0.3 else ''.join(chars))
+    return names
+
+
+def _merged(score_pairs, names):
+    return {
+        frozenset((names[i], names[j]))
+        for i, j, _ in score_pairs(names, THRESHOLD)
+    }
+
+
+def _write_entities(path, names):
+    entities = {
+        f'ent_{index:03d}': {'canonical_name': name, 'transaction_count': index}
+        for index, name in enumerate(names)
+    }
+    path.write_bytes(orjson.dumps({'entities': entities}))
+    return entities
+
+
+@pytest.mark.parametrize('score_pairs', SCORERS)
+@pytest.mark.parametrize('pair', DISTINCT_PAIRS)
+def test_sub_brands_stay_apart(score_pairs, pair):
+    assert not _merged(score_pairs, list(pair))
+
+
+def test_lcs_ratio_scale():
+    pairs = resolution._lcs_pairs([' abcac d bc', ' d d adbd'], 0.0)
+    assert pairs == [(0, 1, 0.5)]
+
+
+@pytest.mark.parametrize('score_pairs', SCORERS)
+def test_scorers_agree_exactly(score_pairs):
+    expected = resolution._lcs_pairs(NAMES, 0.0)
+    assert score_pairs(NAMES, 0.0) == expected
+
+
+def test_scorers_agree_on_perturbed_names():
+    names = _perturbed_names(100)
+    expected = resolution._lcs_pairs(names, THRESHOLD)
+    assert expected
+    for score_pairs in SCORERS[1:]:
+        assert score_pairs(names, THRESHOLD) == expected
+
+
+@pytest.mark.skipif(not resolution.RAPIDFUZZ_AVAILABLE, reason='rapidfuzz not installed')
+@pytest.mark.parametrize('tile_cells', [1, 100, 1 << 22])
+def test_rapidfuzz_tiles_match_lcs(monkeypatch, tile_cells):
+    names = _perturbed_names(40)
+    monkeypatch.setattr(resolution, 'SIMILARITY_TILE_CELLS', tile_cells)
+    assert resolution._rapidfuzz_pairs(names, THRESHOLD) == resolution._lcs_pairs(names, THRESHOLD)
+    assert resolution._rapidfuzz_pairs(NAMES, 0.0) == resolution._lcs_pairs(NAMES, 0.0)
+
+
+def test_find_duplicates_same_on_every_backend(tmp_path, monkeypatch):
+    entities_file = tmp_path / 'entities.json'
+    entities = _write_entities(entities_file, NAMES)
+    job = resolution.EntityMergeJobWithLineage(entities_file)
+
+    default = job._find_duplicates(entities)
+    monkeypatch.setattr(resolution, 'RAPIDFUZZ_AVAILABLE', False)
+    without_rapidfuzz = job._find_duplicates(entities)
+    monkeypatch.setattr(resolution, 'NUMBA_AVAILABLE', False)
+    pure_python = job._find_duplicates(entities)
+
+    assert default == without_rapidfuzz == pure_python
+    assert {frozenset(pair[:2]) for pair in default} == {
+        frozenset(('ent_004', 'ent_005')),  # Amazon.com / Amazon com
+        frozenset(('ent_012', 'ent_013')),  # Walmart / Wal-Mart
+        frozenset(('ent_014', 'ent_015')),  # Netflix / NETFLIX
+        frozenset(('ent_016', 'ent_017')),  # Trader Joe's / Trader Joes
+        frozenset(('ent_018', 'ent_019')),  # Whole Foods Market / Mkt
+    }
+
+
+def test_merge_with_lineage(tmp_path):
+    entities_file = tmp_path / 'entities.json'
+    _write_entities(entities_file, ['Netflix', 'NETFLIX', 'Netflix Inc', 'Safeway'])
+
+    report = resolution.EntityMergeJobWithLineage(entities_file).run_merge_with_lineage()
+
+    assert report['duplicates_found'] == 1
+    assert report['entities_merged'] == 1
+    merged = orjson.loads(entities_file.read_bytes())['entities']
+    assert merged['ent_000']['status'] == 'superseded'
+    assert merged['ent_000']['superseded_by'] == 'ent_001'
+    assert merged['ent_001']['merged_from'] == ['ent_000']
+    assert merged['ent_001']['aliases'] == ['Netflix']
+    assert 'status' not in merged['ent_002']
+
+    lineage = orjson.loads((tmp_path / 'entity_lineage.json').read_bytes())
+    assert lineage['lineage_count'] == 1
+    assert lineage['lineage'][0]['old_entity_id'] == 'ent_000'
+    assert lineage['lineage'][0]['new_entity_id'] == 'ent_001'
+
+    # Re-running is idempotent: superseded entities are skipped
+    rerun = resolution.EntityMergeJobWithLineage(entities_file).run_merge_with_lineage()
+    assert rerun['duplicates_found'] == 0
+
+
+@pytest.mark.skipif(not resolution.SKLEARN_AVAILABLE, reason='scikit-learn not installed')
+def test_tfidf_candidates_keep_every_merge():
+    names = _perturbed_names(200)
+    assert resolution._tfidf_pairs(names, THRESHOLD) == resolution._lcs_pairs(names, THRESHOLD)
+
+
+@pytest.mark.skipif(not resolution.SKLEARN_AVAILABLE, reason='scikit-learn not installed')
+def test_find_duplicates_same_with_tfidf_candidates(tmp_path, monkeypatch):
+    entities_file = tmp_path / 'entities.json'
+    entities = _write_entities(entities_file, NAMES)
+    job = resolution.EntityMergeJobWithLineage(entities_file)
+
+    exact = job._find_duplicates(entities)
+    monkeypatch.setattr(resolution, 'TFIDF_MIN_BLOCK', 2)
+    assert job._find_duplicates(entities) == exact
+
+
+def test_normalize_merchant_is_cached_without_patching_the_class():
+    resolution.normalize_merchant.cache_clear()
+
+    first = resolution.normalize_merchant('AMAZON.COM*MKTPLACE')
+    second = resolution.normalize_merchant('AMAZON.COM*MKTPLACE')
+
+    assert first == second == resolution.MerchantNormalizer().normalize('AMAZON.COM*MKTPLACE')
+    assert resolution.normalize_merchant.cache_info().hits == 1
+    assert not hasattr(resolution.MerchantNormalizer.normalize, '__wrapped__')
+
+
+def test_merged_secondary_is_not_merged_again(tmp_path):
+    entities_file = tmp_path / 'entities.json'
+    _write_entities(entities_file, ['Netflix', 'NETFLIX', 'netflix'])
+
+    report = resolution.EntityMergeJobWithLineage(entities_file).run_merge_with_lineage()
+
+    assert report['duplicates_found'] == 3
+    secondaries = [entry['secondary'] for entry in report['merge_log']]
+    assert len(secondaries) == len(set(secondaries)) == 2
+    merged = orjson.loads(entities_file.read_bytes())['entities']
+    assert [entity.get('status') for entity in merged.values()] == ['superseded', 'superseded', None]
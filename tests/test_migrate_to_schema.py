@@ -0,0 +1,45 @@
+"""Tests for migrate_to_schema"""
+
+from datetime import datetime
+
+import orjson
+
+import migrate_to_schema as migrate
+
+
+def _statement_ids(path):
+    lines = path.read_bytes().splitlines()[1:]
+    return [orjson.loads(line)['statement_id'] for line in lines if b'"statement_id"' in line]
+
+
+def test_each_run_starts_its_own_statement_ids(tmp_path, monkeypatch):
+    ledger = tmp_path / 'ledger.json'
+    ledger.write_bytes(orjson.dumps({'transactions': [
+        {'id': 'tx_1', 'amount': -5.0, 'date': '2024-01-01', 'merchant': 'Shop'},
+    ]}))
+
+    runs = iter([datetime(2024, 1, 1), datetime(2025, 1, 1)])
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(runs)
+
+    monkeypatch.setattr(migrate, 'datetime', Clock)
+
+    migrate.migrate_canonical_ledger(ledger, tmp_path / 'first.ndjson')
+    migrate.migrate_canonical_ledger(ledger, tmp_path / 'second.ndjson')
+
+    first = _statement_ids(tmp_path / 'first.ndjson')
+    second = _statement_ids(tmp_path / 'second.ndjson')
+    assert first[0].endswith('_20240101000000_0')
+    assert second == [statement_id.replace('20240101000000', '20250101000000') for statement_id in first]
+
+
+def test_statement_id_generator_counts_per_instance():
+    first = migrate.StatementIdGenerator('20240101000000')
+    second = migrate.StatementIdGenerator('20240101000000')
+
+    assert first('attr', 'evt_1', 'amount') == 'attr_evt_1_amount_20240101000000_0'
+    assert first('attr', 'evt_1', 'date') == 'attr_evt_1_date_20240101000000_1'
+    assert second('rel', 'evt_1', 'merchant') == 'rel_evt_1_merchant_20240101000000_0'
@@ -0,0 +1,197 @@
+"""Tests for reconcile_with_decisions"""
+
+import orjson
+import pytest
+
+import reconcile_with_decisions as reconcile
+
+
+def _observations(tmp_path, document):
+    path = tmp_path / 'observations.json'
+    path.write_bytes(orjson.dumps(document))
+    return list(reconcile.iter_observations(path))
+
+
+def test_iter_observations_streams_nested_items(tmp_path):
+    document = {
+        'generated_at': '2024-01-01',
+        'observations': [{'observation_id': 'a', 'amount': 1.5, 'tags': [{'x': 1}]}, {'observation_id': 'b'}],
+    }
+    assert _observations(tmp_path, document) == [
+        ('observations', {'observation_id': 'a', 'amount': 1.5, 'tags': [{'x': 1}]}),
+        ('observations', {'observation_id': 'b'}),
+    ]
+
+
+def test_iter_observations_empty_observations_is_final(tmp_path):
+    document = {'observations': [], 'transactions': [{'id': 'legacy'}]}
+    assert _observations(tmp_path, document) == []
+
+
+@pytest.mark.parametrize('document', [
+    {'transactions': [{'id': 'legacy'}], 'observations': [{'id': 'obs'}]},
+    {'all_transactions': [{'id': 'legacy'}], 'observations': [{'id': 'obs'}]},
+    {'observations': [{'id': 'obs'}], 'all_transactions': [{'id': 'legacy'}]},
+])
+def test_iter_observations_prefers_observations_in_any_key_order(tmp_path, document):
+    assert _observations(tmp_path, document) == [('observations', {'id': 'obs'})]
+
+
+def test_iter_observations_trailing_empty_observations_is_final(tmp_path):
+    document = {'transactions': [{'id': 'legacy'}], 'observations': []}
+    assert _observations(tmp_path, document) == []
+
+
+@pytest.mark.parametrize('document, expected', [
+    ({'all_transactions': [{'id': 'a'}], 'transactions': [{'id': 'b'}]}, [('all_transactions', {'id': 'a'})]),
+    ({'all_transactions': [], 'transactions': [{'id': 'b'}]}, [('transactions', {'id': 'b'})]),
+    ({'transactions': [{'id': 'b'}]}, [('transactions', {'id': 'b'})]),
+    ({'transactions': [{'id': 'b'}], 'all_transactions': [{'id': 'a'}]}, [('all_transactions', {'id': 'a'})]),
+    ({'transactions': [{'id': 'b'}], 'all_transactions': []}, [('transactions', {'id': 'b'})]),
+    ({'transactions': [{'id': 'b'}], 'all_transactions': None}, [('transactions', {'id': 'b'})]),
+    ({'meta': {'observations': [{'id': 'nested'}]}, 'transactions': None}, []),
+    ({}, []),
+])
+def test_iter_observations_legacy_keys(tmp_path, document, expected):
+    assert _observations(tmp_path, document) == expected
+
+
+def test_reconcile_one_leaves_payloads_untouched():
+    first = {'observation_id': 'obs_1', 'observer': 'bank_v2', 'amount': 10}
+    second = {'observation_id': 'obs_2', 'data_source': 'card', 'amount': 10}
+    originals = [dict(first), dict(second)]
+    records = [('obs_1', reconcile.resolve_data_source(first), first), ('obs_2', 'card', second)]
+
+    canonical, decision = reconcile.reconcile_one(records, None, 1, '2024-01-01T00:00:00')
+
+    assert [first, second] == originals
+    assert decision.observation_ids == ['obs_1', 'obs_2']
+    assert sorted(decision.cluster_metadata['data_sources']) == ['bank', 'card']
+    assert '_oid' not in orjson.dumps(canonical).decode()
+
+
+@pytest.mark.parametrize('items', [[], [{'id': 'a', 'nested': {'x': [1, 2]}}, {'id': 'b'}]])
+def test_streaming_writer_matches_one_shot_dump(tmp_path, items):
+    path = tmp_path / 'out.json'
+    header = {'generated_at': '2024-01-01', 'meta': {'k': 'v'}, 'count': len(items)}
+    with reconcile.StreamingJsonWriter(path, dict(header), 'items', len(items)) as writer:
+        for item in items:
+            writer.write(item)
+
+    expected = orjson.dumps({**header, 'items': items}, option=reconcile.JSON_WRITE_OPTIONS)
+    assert path.read_bytes() == expected
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_streaming_writer_rejects_count_mismatch(tmp_path):
+    path = tmp_path / 'out.json'
+    with pytest.raises(ValueError):
+        with reconcile.StreamingJsonWriter(path, {'count': 2}, 'items', 2) as writer:
+            writer.write({'id': 'a'})
+    assert list(tmp_path.iterdir()) == []
+
+
+def _reconcile_cached(observations, cache):
+    return [
+        reconcile.reconcile_single_cached(
+            (obs.get('observation_id') or obs.get('id'), 'bank', obs), None, cache
+        )
+        for obs in observations
+    ]
+
+
+def _reconcile_uncached(observations):
+    return [reconcile.reconcile_observations([obs], None) for obs in observations]
+
+
+def test_single_cache_rewrites_only_id_values():
+    # IDs '1' and '2' also occur inside the date; only ID-bearing values may change
+    observations = [
+        {'observation_id': observation_id, 'date': '2024-01-01', 'amount': 12, 'merchant': 'Shop 1'}
+        for observation_id in ('1', '2', '3', '10')
+    ]
+    cache = {}
+    assert _reconcile_cached(observations, cache) == _reconcile_uncached(observations)
+    assert [state[0] for state in cache.values()] == ['template']
+
+
+def test_single_cache_keeps_differing_payloads_apart():
+    observations = [
+        {'observation_id': 'a', 'date': '2024-01-01', 'amount': 12},
+        {'observation_id': 'b', 'date': '2024-01-02', 'amount': 12},
+        {'observation_id': 'c', 'date': '2024-01-01', 'amount': 13},
+        {'observation_id': 'd', 'date': '2024-01-01', 'amount': 12, 'merchant': 'Shop'},
+    ]
+    cache = {}
+    assert _reconcile_cached(observations, cache) == _reconcile_uncached(observations)
+    assert len(cache) == 4
+
+
+def test_single_cache_marks_unexplained_differences_uncacheable(monkeypatch):
+    calls = []
+    plain = reconcile.reconcile_observations
+
+    def counting(observations, registry=None):
+        calls.append(observations)
+        canonical = plain(observations, registry)
+        canonical['run'] = len(calls)
+        return canonical
+
+    monkeypatch.setattr(reconcile, 'reconcile_observations', counting)
+    observations = [{'observation_id': observation_id, 'amount': 5} for observation_id in 'abcd']
+    cache = {}
+    results = _reconcile_cached(observations, cache)
+
+    assert [result['run'] for result in results] == [1, 2, 3, 4]
+    assert list(cache.values()) == [('uncacheable',)]
+
+
+def test_single_cache_skips_non_string_ids():
+    observations = [{'id': 7, 'amount': 5}, {'id': 8, 'amount': 5}, {'id': 9, 'amount': 5}]
+    cache = {}
+    assert _reconcile_cached(observations, cache) == _reconcile_uncached(observations)
+    assert cache == {}
+
+
+def test_single_cache_handles_duplicate_ids():
+    observations = [
+        {'observation_id': observation_id, 'amount': 5, 'date': '2024-01-01'}
+        for observation_id in ('x', 'x', 'y', 'x', 'z')
+    ]
+    cache = {}
+    assert _reconcile_cached(observations, cache) == _reconcile_uncached(observations)
+    assert [state[0] for state in cache.values()] == ['template']
+
+
+def test_single_cache_stays_within_maxsize():
+    observations = [
+        {'observation_id': f'{amount}-{copy}', 'amount': amount}
+        for copy in range(3) for amount in range(10)
+    ]
+    cache = {}
+    for obs in observations:
+        reconcile.reconcile_single_cached((obs['observation_id'], 'bank', obs), None, cache, maxsize=4)
+        assert len(cache) <= 4
+
+    # Only the 4 most recently used payloads survive
+    assert len(cache) == 4
+    kept = {reconcile.observation_cache_key({'observation_id': 'x', 'amount': amount}, 'observation_id')
+            for amount in range(6, 10)}
+    assert set(cache) == kept
+
+
+def test_single_cache_evicts_least_recently_used():
+    def reconcile_amount(amount, observation_id, cache):
+        obs = {'observation_id': observation_id, 'amount': amount}
+        return reconcile.reconcile_single_cached((observation_id, 'bank', obs), None, cache, maxsize=2)
+
+    cache = {}
+    reconcile_amount(1, 'a', cache)
+    reconcile_amount(2, 'b', cache)
+    reconcile_amount(1, 'c', cache)  # Hit: amount 1 becomes most recently used
+    reconcile_amount(3, 'd', cache)  # Evicts amount 2
+
+    assert [state[0] for state in cache.values()] == ['template', 'first']
+    assert reconcile_amount(1, 'e', cache) == reconcile.reconcile_observations(
+        [{'observation_id': 'e', 'amount': 1}], None
+    )
@@ -0,0 +1,423 @@
+"""Tests for storage.schema"""
+
+import io
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage import schema  # noqa: E402
+from storage.schema import (  # noqa: E402
+    AttributeFact, EntityLineage, EntityNode, EntityType, EventNode, EventType, FieldStrategy,
+    Provenance, ReconciliationDecision, RelationshipFact, SeriesNode, SeriesType, StorageSchema,
+    TemporalQualifiers,
+)
+
+
+def _fact(statement_id, obj):
+    return AttributeFact(
+        statement_id=statement_id,
+        subject_id='ent_merchant_safeway_123',
+        predicate='canonical_name',
+        object=obj,
+        temporal=TemporalQualifiers(valid_from='2024-01-01T00:00:00'),
+        provenance=Provenance(
+            observation_ids=['obs_1'],
+            source_method='test',
+            observer='test',
+            created_at='2024-01-01T00:00:00',
+            confidence=1.0,
+        ),
+    )
+
+
+def test_equal_fact_objects_share_one_read_only_instance():
+    first = _fact('stmt_1', {'value': 'Safeway', 'type': 'string'})
+    second = _fact('stmt_2', {'value': 'Safeway', 'type': 'string'})
+
+    assert first.object is second.object
+    assert first.object == {'value': 'Safeway', 'type': 'string'}
+    with pytest.raises(TypeError):
+        first.object['value'] = 'Safeway Inc'
+    with pytest.raises(TypeError):
+        first.object.update(value='Safeway Inc')
+    assert second.object == {'value': 'Safeway', 'type': 'string'}
+
+
+def test_fact_object_does_not_alias_caller_dict():
+    obj = {'value': 'Safeway', 'type': 'string'}
+    fact = _fact('stmt_1', obj)
+
+    obj['value'] = 'Changed'
+    assert fact.object == {'value': 'Safeway', 'type': 'string'}
+
+
+@pytest.mark.parametrize('first, second', [
+    ({'value': 1, 'type': 'number'}, {'value': True, 'type': 'number'}),
+    ({'value': 0.0, 'type': 'number'}, {'value': -0.0, 'type': 'number'}),
+    ({'value': 'a', 'type': 'string'}, {'type': 'string', 'value': 'a'}),
+])
+def test_fact_objects_share_only_identical_values(first, second):
+    first_fact = _fact('stmt_1', first)
+    second_fact = _fact('stmt_2', second)
+
+    assert first_fact.object is not second_fact.object
+    assert orjson.dumps(first_fact.object) == orjson.dumps(first)
+    assert orjson.dumps(second_fact.object) == orjson.dumps(second)
+    with pytest.raises(TypeError):
+        second_fact.object.pop('value')
+
+
+def test_fact_objects_survive_pickling_read_only():
+    store = StorageSchema()
+    store.add_attribute_facts([_fact('stmt_1', {'value': 'Safeway', 'type': 'string'}),
+                               _fact('stmt_2', {'value': 12.5, 'type': 'number'})])
+
+    first, second = pickle.loads(pickle.dumps(store)).attribute_facts
+
+    assert first.object is store.attribute_facts[0].object  # re-shared on load
+    assert second.object == {'value': 12.5, 'type': 'number'}
+    with pytest.raises(TypeError):
+        second.object['value'] = 0
+
+
+def _temporal(valid_from, valid_to=None):
+    return TemporalQualifiers(valid_from=valid_from, valid_to=valid_to, observed_at='2024-06-01T00:00:00')
+
+
+def _provenance(*observation_ids):
+    return Provenance(
+        observation_ids=list(observation_ids),
+        source_method='test',
+        observer='test',
+        created_at='2024-01-01T00:00:00',
+        confidence=1.0,
+    )
+
+
+def _attribute(statement_id, subject_id, predicate, value, temporal=None, provenance=None):
+    return AttributeFact(
+        statement_id=statement_id,
+        subject_id=subject_id,
+        predicate=predicate,
+        object={'value': value, 'type': 'string'},
+        temporal=temporal or _temporal('2024-01-01T00:00:00'),
+        provenance=provenance or _provenance('obs_1'),
+    )
+
+
+def _lineage(lineage_id, old_entity_id, new_entity_id, timestamp='2024-01-01T00:00:00'):
+    return EntityLineage(
+        lineage_id=lineage_id,
+        timestamp=timestamp,
+        old_entity_id=old_entity_id,
+        new_entity_id=new_entity_id,
+        operation='merge',
+        reason='test',
+        confidence=1.0,
+        performed_by='automated_merge',
+        created_at='2024-01-01T00:00:00',
+    )
+
+
+def _populated_store():
+    """A store with every record kind, sharing qualifiers the way migration does"""
+    store = StorageSchema()
+    store.add_entity(EntityNode(entity_id='ent_1', type=EntityType.MERCHANT, aliases=['Shop', 'SHOP'],
+                                created_at='2024-01-01T00:00:00', updated_at='2024-01-01T00:00:00'))
+    store.add_event(EventNode(event_id='evt_1', event_type=EventType.FINANCE_TRANSACTION, happened_at='2024-01-05',
+                              snapshot={'amount': -12.5, 'currency': 'USD', 'memo': 'x'},
+                              created_at='2024-01-01T00:00:00', updated_at='2024-01-01T00:00:00'))
+    store.add_series(SeriesNode(series_id='ser_1', series_type=SeriesType.SAAS_SUBSCRIPTION, merchant_id='ent_1',
+                                created_at='2024-01-01T00:00:00', updated_at='2024-01-01T00:00:00'))
+
+    temporal = _temporal('2024-01-05')
+    provenance = _provenance('obs_1', 'obs_2')
+    store.add_attribute_facts([
+        _attribute('attr_1', 'evt_1', 'description', 'Shop', temporal, provenance),
+        _attribute('attr_2', 'evt_1', 'currency', 'USD', temporal, provenance),
+        _attribute('attr_3', 'ent_1', 'canonical_name', 'Shop'),
+    ])
+    store.add_relationship_fact(RelationshipFact(
+        statement_id='rel_1', subject_id='evt_1', predicate='merchant', target_id='ent_1',
+        temporal=temporal, provenance=provenance,
+    ))
+    store.add_reconciliation_decision(ReconciliationDecision(
+        decision_id='dec_1',
+        timestamp='2024-01-05T00:00:00',
+        observation_ids=['obs_1', 'obs_2'],
+        cluster_metadata={'data_sources': ['bank', 'card']},
+        field_strategies={'amount': FieldStrategy('first_source', 'obs_1', 0.9, ({'value': -12},))},
+        created_statement_ids=['attr_1'],
+        confidence=0.9,
+        decision_method='automated',
+        created_at='2024-01-05T00:00:00',
+    ))
+    store.add_entity_lineage(_lineage('lin_1', 'ent_0', 'ent_1'))
+    return store
+
+
+def test_get_attributes_uses_subject_and_predicate_indexes():
+    store = StorageSchema()
+    store.add_attribute_fact(_attribute('attr_1', 'evt_1', 'amount', '1'))
+    store.add_attribute_facts([
+        _attribute('attr_2', 'evt_1', 'date', '2024-01-01'),
+        _attribute('attr_3', 'evt_2', 'amount', '2'),
+        _attribute('attr_4', 'evt_1', 'amount', '3'),
+    ])
+
+    def ids(facts):
+        return [fact.statement_id for fact in facts]
+
+    assert ids(store.get_attributes('evt_1')) == ['attr_1', 'attr_2', 'attr_4']
+    # A predicate built at runtime (not interned) still hits the composite index
+    assert ids(store.get_attributes('evt_1', ''.join(['amo', 'unt']))) == ['attr_1', 'attr_4']
+    assert store.get_attributes('evt_1', 'missing') == []
+    assert store.get_attributes('evt_missing') == []
+
+    # Returned lists are copies, not the index's own lists
+    store.get_attributes('evt_1').clear()
+    assert len(store.get_attributes('evt_1')) == 3
+
+
+def test_get_relationships_uses_subject_and_predicate_indexes():
+    store = StorageSchema(relationship_facts=[
+        RelationshipFact('rel_1', 'evt_1', 'merchant', 'ent_1', _temporal('2024-01-01'), _provenance()),
+        RelationshipFact('rel_2', 'evt_1', 'payer', 'ent_2', _temporal('2024-01-01'), _provenance()),
+    ])
+    store.add_relationship_fact(
+        RelationshipFact('rel_3', 'evt_1', 'merchant', 'ent_3', _temporal('2024-01-01'), _provenance()))
+
+    assert [fact.target_id for fact in store.get_relationships('evt_1', 'merchant')] == ['ent_1', 'ent_3']
+    assert len(store.get_relationships('evt_1')) == 3
+
+
+def test_fact_ids_are_pooled_on_bulk_paths_only():
+    store = StorageSchema()
+    single = _provenance(''.join(['obs_', '1']))
+    single_ids = single.observation_ids
+    store.add_attribute_fact(_attribute('attr_1', 'evt_1', 'amount', '1', provenance=single))
+    assert store.attribute_facts[0].provenance.observation_ids is single_ids
+    assert store._id_pool == {}
+
+    first, second = _provenance(''.join(['obs_', '2'])), _provenance(''.join(['obs_', '2']))
+    assert first.observation_ids[0] is not second.observation_ids[0]
+    store.add_attribute_facts([
+        _attribute('attr_2', 'evt_2', 'amount', '2', provenance=first),
+        _attribute('attr_3', 'evt_3', 'amount', '3', provenance=second),
+    ])
+    assert first.observation_ids[0] is second.observation_ids[0]
+
+
+@pytest.mark.parametrize('batch', [False, True])
+def test_valid_time_index_stays_sorted_and_answers_boundaries(batch):
+    facts = [
+        _attribute('attr_feb', 'ent_1', 'canonical_name', 'Shop Inc', _temporal('2024-02-01')),
+        _attribute('attr_jan', 'ent_1', 'canonical_name', 'Shop', _temporal('2024-01-01', '2024-02-01')),
+        _attribute('attr_open', 'ent_1', 'canonical_name', 'SHOP', _temporal(None, '2024-01-01')),
+    ]
+    store = StorageSchema()
+    if batch:
+        store.add_attribute_facts(facts)
+    else:
+        for fact in facts:
+            store.add_attribute_fact(fact)
+
+    assert store._attr_valid_index == {}  # built on the first as-of query
+
+    def valid_at(as_of):
+        return [fact.statement_id for fact in store.get_attributes_as_of('ent_1', 'canonical_name', as_of)]
+
+    assert valid_at('2023-06-01') == ['attr_open']
+    entries = store._attr_valid_index[('ent_1', 'canonical_name')]
+    assert [start for start, _, _ in entries] == sorted(start for start, _, _ in entries)
+    # valid_from is inclusive, valid_to exclusive
+    assert valid_at('2024-01-01') == ['attr_jan']
+    assert valid_at('2024-01-31T23:59:59') == ['attr_jan']
+    assert valid_at('2024-02-01') == ['attr_feb']
+    assert valid_at('02/01/2024') == ['attr_feb']
+    assert valid_at(datetime(2030, 1, 1)) == ['attr_feb']
+    assert store.get_attributes_as_of('ent_1', 'missing', '2024-01-01') == []
+    with pytest.raises(ValueError):
+        valid_at('not a date')
+
+
+def test_valid_time_index_picks_up_facts_added_after_a_query():
+    store = StorageSchema()
+    store.add_attribute_fact(_attribute('attr_late', 'ent_1', 'name', 'B', _temporal('2024-06-01')))
+    assert store.get_attributes_as_of('ent_1', 'name', '2024-03-01') == []
+
+    store.add_attribute_facts([
+        _attribute('attr_early', 'ent_1', 'name', 'A', _temporal('2024-01-01', '2024-06-01')),
+        _attribute('attr_tie', 'ent_1', 'name', 'C', _temporal('2024-06-01')),
+    ])
+
+    def valid_at(as_of):
+        return [fact.statement_id for fact in store.get_attributes_as_of('ent_1', 'name', as_of)]
+
+    assert valid_at('2024-03-01') == ['attr_early']
+    assert valid_at('2024-06-01') == ['attr_late', 'attr_tie']  # equal starts keep insertion order
+
+
+def test_relationships_as_of_use_valid_time_index():
+    store = StorageSchema()
+    store.add_relationship_facts([
+        RelationshipFact('rel_2', 'evt_1', 'merchant', 'ent_2', _temporal('2024-03-01'), _provenance()),
+        RelationshipFact('rel_1', 'evt_1', 'merchant', 'ent_1', _temporal('2024-01-01', '2024-03-01'), _provenance()),
+    ])
+
+    assert [f.target_id for f in store.get_relationships_as_of('evt_1', 'merchant', '2024-02-29')] == ['ent_1']
+    assert [f.target_id for f in store.get_relationships_as_of('evt_1', 'merchant', '2024-03-01')] == ['ent_2']
+
+
+def test_resolve_current_entity_id_compresses_paths():
+    store = StorageSchema()
+    for index, (old, new) in enumerate([('a', 'b'), ('b', 'c'), ('c', 'd')]):
+        store.add_entity_lineage(_lineage(f'lin_{index}', old, new))
+
+    assert store.resolve_current_entity_id('a') == 'd'
+    assert store._successor == {'a': 'd', 'b': 'd', 'c': 'd'}
+    assert store.resolve_current_entity_id('d') == 'd'
+    assert store.resolve_current_entity_id('unknown') == 'unknown'
+
+    # A later edge extends the chain past the compressed end
+    store.add_entity_lineage(_lineage('lin_3', 'd', 'e'))
+    assert [store.resolve_current_entity_id(entity_id) for entity_id in 'abcd'] == ['e'] * 4
+
+
+def test_lineage_cycle_restarts_from_raw_edges():
+    store = StorageSchema()
+    store.add_entity_lineage(_lineage('lin_1', 'a', 'b'))
+    store.add_entity_lineage(_lineage('lin_2', 'b', 'c'))
+    assert store.resolve_current_entity_id('a') == 'c'  # compresses a -> c
+
+    store.add_entity_lineage(_lineage('lin_3', 'c', 'a'))
+
+    assert store._successor == {'a': 'b', 'b': 'c', 'c': 'a'}
+    # Each walk around the loop stops where it started, as on the raw edges
+    assert [store.resolve_current_entity_id(entity_id) for entity_id in 'abc'] == ['a', 'b', 'c']
+    assert store._successor == {'a': 'b', 'b': 'c', 'c': 'a'}
+
+
+def test_lineage_as_of_follows_only_earlier_records():
+    store = StorageSchema()
+    store.add_entity_lineage(_lineage('lin_2', 'b', 'c', '2024-03-01T00:00:00'))
+    store.add_entity_lineage(_lineage('lin_1', 'a', 'b', '2024-01-01T00:00:00'))
+
+    assert [record.lineage_id for record in store.get_lineage_as_of('2024-03-01')] == ['lin_1', 'lin_2']
+    assert [record.lineage_id for record in store.get_lineage_as_of('2024-02-01')] == ['lin_1']
+    assert store.resolve_entity_id_as_of('a', '2024-02-01') == 'b'
+    assert store.resolve_entity_id_as_of('a', '2024-03-01') == 'c'
+    assert store.resolve_entity_id_as_of('a', '2023-12-31') == 'a'
+
+
+@pytest.mark.parametrize('record', [
+    EntityNode(entity_id='ent_1', type=EntityType.MERCHANT, aliases=('Shop',), external_ids={'x': '1'}),
+    EventNode(event_id='evt_1', event_type=EventType.FINANCE_TRANSACTION, happened_at='2024-01-05',
+              snapshot={'amount': -1.5, 'memo': 'x'}),
+    EventNode(event_id='evt_2', event_type=EventType.FINANCE_TRANSACTION, happened_at='2024-01-05'),
+    SeriesNode(series_id='ser_1', series_type=SeriesType.SAAS_SUBSCRIPTION, expected_amount=9.99),
+    _attribute('attr_1', 'evt_1', 'amount', '1', _temporal('2024-01-01', '2024-02-01'), _provenance('obs_1')),
+    RelationshipFact('rel_1', 'evt_1', 'merchant', 'ent_1', _temporal('2024-01-01'), _provenance(),
+                     rejected_alternatives=[{'target_id': 'ent_2'}]),
+    _lineage('lin_1', 'a', 'b'),
+    FieldStrategy('first_source', 'obs_1', 0.5, ['obs_2']),
+])
+def test_codegen_from_dict_inverts_to_dict(record):
+    data = orjson.loads(orjson.dumps(record.to_dict()))
+    loaded = type(record).from_dict(data)
+
+    assert loaded == record
+    assert loaded.to_dict() == record.to_dict()
+
+
+def test_codegen_from_dict_rebuilds_derived_fields():
+    loaded = TemporalQualifiers.from_dict({'valid_from': '2024-01-01', 'valid_to': None,
+                                           'observed_at': '2024-01-01', 'superseded_at': None})
+    assert loaded._valid_from_ts == TemporalQualifiers(valid_from='2024-01-01')._valid_from_ts
+    assert loaded._valid_to_ts == float('inf')
+
+    event = EventNode.from_dict({'event_id': 'evt_1', 'event_type': 'finance_transaction', 'happened_at': '2024-01-05',
+                                 'snapshot': {'currency': 'MXN'}})
+    assert event.event_type is EventType.FINANCE_TRANSACTION
+    assert event.snapshot_currency == 'MXN' and event.snapshot == {}
+
+
+def test_storage_round_trips_through_json():
+    store = _populated_store()
+
+    loaded = StorageSchema.from_dict(orjson.loads(store.to_json_bytes()))
+
+    assert loaded.to_dict() == store.to_dict()
+    assert [fact.statement_id for fact in loaded.get_attributes('evt_1')] == ['attr_1', 'attr_2']
+    assert loaded.resolve_current_entity_id('ent_0') == 'ent_1'
+
+
+def test_storage_pickle_keeps_indexes_and_shared_qualifiers():
+    store = _populated_store()
+
+    loaded = pickle.loads(pickle.dumps(store))
+
+    assert loaded.to_dict() == store.to_dict()
+    first, second, third = loaded.attribute_facts
+    assert first.temporal is second.temporal and first.provenance is second.provenance
+    assert third.temporal is not first.temporal
+    assert loaded.relationship_facts[0].temporal is first.temporal
+    assert loaded.relationship_facts[0].provenance is first.provenance
+
+    assert [fact.statement_id for fact in loaded.get_attributes('evt_1', 'currency')] == ['attr_2']
+    assert [fact.statement_id for fact in loaded.get_attributes_as_of('evt_1', 'description', '2024-01-05')] == \
+        ['attr_1']
+    assert [fact.target_id for fact in loaded.get_relationships('evt_1', 'merchant')] == ['ent_1']
+    assert loaded.get_reconciliation_decision('dec_1') == store.get_reconciliation_decision('dec_1')
+    assert loaded.resolve_current_entity_id('ent_0') == 'ent_1'
+
+
+@pytest.mark.parametrize('store', [StorageSchema(), _populated_store()])
+def test_write_json_matches_to_json_bytes(store):
+    buffer = io.BytesIO()
+    store.write_json(buffer)
+
+    assert buffer.getvalue() == store.to_json_bytes()
+    assert orjson.loads(buffer.getvalue()) == orjson.loads(orjson.dumps(store.to_dict()))
+
+
+def _scan_store():
+    store = StorageSchema()
+    store.add_attribute_facts([
+        _attribute('attr_1', 'evt_1', 'amount', '1', _temporal('2024-01-01', '2024-02-01')),
+        _attribute('attr_2', 'evt_1', 'date', '2024-01-01', _temporal('2024-01-01')),
+        _attribute('attr_3', 'evt_2', 'amount', '2', _temporal('2024-02-01')),
+    ])
+    return store
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'subject_id': 'evt_1'},
+    {'predicate': 'amount'},
+    {'predicate': 'missing'},
+    {'subject_id': 'evt_2', 'predicate': 'amount'},
+    {'as_of': '2024-01-15'},
+    {'as_of': '2024-02-01'},
+    {'predicate': 'amount', 'as_of': '2024-02-01'},
+    {'subject_id': 'evt_1', 'predicate': 'amount', 'as_of': '2023-12-31'},
+])
+def test_find_attributes_arrow_path_matches_python_fallback(monkeypatch, filters):
+    pytest.importorskip('pyarrow')
+    store = _scan_store()
+    # Extend the cached table once before querying, as repeated scans do
+    store.attribute_table()
+    store.add_attribute_fact(_attribute('attr_4', 'evt_3', 'amount', '3', _temporal('2023-01-01')))
+
+    vectorized = store.find_attributes(**filters)
+    assert store.attribute_table().num_rows == len(store.attribute_facts)
+    monkeypatch.setattr(schema, 'PYARROW_AVAILABLE', False)
+    fallback = store.find_attributes(**filters)
+
+    assert [fact.statement_id for fact in vectorized] == [fact.statement_id for fact in fallback]